@@ -172,10 +172,10 @@ class AdvancedAnalytics:
             JOIN problems p ON pr.problem_id = p.id
             WHERE pr.status = 'completed' 
             AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
+            AND pr.completed_at >= ?
             GROUP BY DATE(pr.completed_at), p.difficulty, p.topic
             ORDER BY date
-        '''.format(days), conn, params=(language,))
+        ''', conn, params=(language, self._window_start(days)))
         conn.close()
         
         if df.empty:
@@ -241,9 +241,9 @@ class AdvancedAnalytics:
             JOIN problems p ON pr.problem_id = p.id
             WHERE pr.status = 'completed' 
             AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
+            AND pr.completed_at >= ?
             ORDER BY pr.completed_at
-        '''.format(days), conn, params=(language,))
+        ''', conn, params=(language, self._window_start(days)))
         conn.close()
         
         if df.empty:
@@ -315,9 +315,9 @@ class AdvancedAnalytics:
             JOIN problems p ON pr.problem_id = p.id
             WHERE pr.status = 'completed' 
             AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
+            AND pr.completed_at >= ?
             ORDER BY pr.completed_at
-        '''.format(days), conn, params=(language,))
+        ''', conn, params=(language, self._window_start(days)))
         conn.close()
         
         if df.empty or len(df) < 10:
@@ -351,10 +351,10 @@ class AdvancedAnalytics:
             JOIN problems p ON pr.problem_id = p.id
             WHERE pr.status = 'completed' 
             AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
+            AND pr.completed_at >= ?
             GROUP BY DATE(pr.completed_at), p.difficulty
             ORDER BY date
-        '''.format(days), conn, params=(language,))
+        ''', conn, params=(language, self._window_start(days)))
         conn.close()
         
         if df.empty:
@@ -475,8 +475,8 @@ class AdvancedAnalytics:
             JOIN problems p ON pr.problem_id = p.id
             WHERE pr.status = 'completed' 
             AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
-        '''.format(days), conn, params=(language,))
+            AND pr.completed_at >= ?
+        ''', conn, params=(language, self._window_start(days)))
         conn.close()
         
         if df.empty:
@@ -706,6 +706,15 @@ class AdvancedAnalytics:
         return comparison
     
     # Helper methods
+    def _window_start(self, days):
+        """First date of a trailing window, bound as a query parameter
+        
+        completed_at holds ISO timestamps, which compare after their own
+        date, so `completed_at >= ?` matches DATE() filtering while keeping
+        the SQL text constant for the statement cache.
+        """
+        return (datetime.now() - timedelta(days=days)).date().isoformat()
+    
     def _calculate_consistency(self, daily_totals):
         """Calculate consistency score"""
         if len(daily_totals) < 3:
@@ -967,8 +976,8 @@ class AdvancedAnalytics:
                 JOIN problems p ON pr.problem_id = p.id
                 WHERE pr.status = 'completed' 
                 AND pr.language = ?
-                AND DATE(pr.completed_at) >= DATE('now', '-{} days')
-            '''.format(days), (language,))
+                AND pr.completed_at >= ?
+            ''', (language, self._window_start(days)))
             
             result = cursor.fetchone()
             conn.close()
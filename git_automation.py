@@ -361,33 +361,29 @@ class GitAutomation:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Get dates with completed problems
+            # Gap-and-islands: consecutive days share the same
+            # JULIANDAY(day) - ROW_NUMBER() value, so the streak is the size
+            # of the island containing today. Days after today (a UTC
+            # completed_at ahead of the local date) are left out
+            today = datetime.now().date().isoformat()
             cursor.execute('''
-                SELECT DISTINCT DATE(completed_at) as date
-                FROM progress 
-                WHERE status = 'completed'
-                ORDER BY date DESC
-            ''')
-            
-            dates = [row[0] for row in cursor.fetchall()]
+                WITH days AS (
+                    SELECT DISTINCT DATE(completed_at) AS day
+                    FROM progress
+                    WHERE status = 'completed' AND completed_at IS NOT NULL
+                    AND DATE(completed_at) <= ?
+                ),
+                islands AS (
+                    SELECT day, JULIANDAY(day) - ROW_NUMBER() OVER (ORDER BY day) AS island
+                    FROM days
+                )
+                SELECT COUNT(*) FROM islands
+                WHERE island = (SELECT island FROM islands WHERE day = ?)
+            ''', (today, today))
+            
+            streak = cursor.fetchone()[0]
             conn.close()
             
-            if not dates:
-                return 0
-            
-            # Calculate streak
-            streak = 0
-            current_date = datetime.now().date()
-            
-            for date_str in dates:
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-                expected_date = current_date - timedelta(days=streak)
-                
-                if date_obj == expected_date:
-                    streak += 1
-                elif date_obj < expected_date:
-                    break
-            
             return streak
         
         except Exception:
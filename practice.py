@@ -217,17 +217,17 @@ class PracticeManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        for problem in basic_problems:
-            cursor.execute('''
-                INSERT OR IGNORE INTO problems 
-                (title, slug, difficulty, topic, platform, description, examples, constraints, hints, url, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                problem['title'], problem['slug'], problem['difficulty'],
-                problem['topic'], problem['platform'], problem['description'],
-                problem['examples'], problem['constraints'], problem['hints'],
-                problem['url'], problem['tags']
-            ))
+        # Single prepared statement and a single transaction for the whole set
+        cursor.executemany('''
+            INSERT OR IGNORE INTO problems 
+            (title, slug, difficulty, topic, platform, description, examples, constraints, hints, url, tags)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(
+            problem['title'], problem['slug'], problem['difficulty'],
+            problem['topic'], problem['platform'], problem['description'],
+            problem['examples'], problem['constraints'], problem['hints'],
+            problem['url'], problem['tags']
+        ) for problem in basic_problems])
         
         conn.commit()
         conn.close()
@@ -6,15 +6,39 @@ Tests all components: PWA, Analytics, API, Notifications, Sessions
 
 import os
 import sys
+import io
+import contextlib
+import asyncio
+import functools
+import importlib.util
 import sqlite3
-import json
 import time
-import requests
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
-import logging
+
+# Statement cache size for test database connections; the stdlib default of
+# 128 is easily exhausted when every component issues its own queries
+SQLITE_CACHED_STATEMENTS = 512
+
+# Row and progress counts for the integration check, fetched as a single row
+DB_COUNTS_QUERY = "SELECT (SELECT COUNT(*) FROM problems), (SELECT COUNT(*) FROM progress)"
+
+@functools.lru_cache(maxsize=None)
+def is_module_available(name):
+    """Check whether a module can be imported without executing it"""
+    return importlib.util.find_spec(name) is not None
+
+@dataclass(slots=True)
+class TestDetail:
+    """Outcome of a single test run"""
+    name: str
+    status: str
+    message: str
+
+# Serializes per-test output flushes so buffered reports never interleave
+output_lock = threading.Lock()
 
 # Test results tracking
 test_results = {
@@ -41,10 +65,29 @@ class TestRunner:
         test_dir = self.project_root / "test_data"
         test_dir.mkdir(exist_ok=True)
         
+        # Checked before connecting, since connecting creates the file
+        needs_seed = not self.test_db_path.exists()
+        
+        # One long-lived connection shared by every test that queries the test DB
+        self._conn = self._connect(self.test_db_path)
+        
         # Create test database
-        if not self.test_db_path.exists():
+        if needs_seed:
             self.create_test_database()
     
+    @staticmethod
+    def _connect(db_path):
+        """Open a test database connection usable from any runner thread"""
+        return sqlite3.connect(
+            db_path,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+            check_same_thread=False
+        )
+    
+    def close(self):
+        """Close the shared test database connection"""
+        self._conn.close()
+    
     def import_modules(self):
         """Import all modules for testing"""
         try:
@@ -99,7 +142,7 @@ class TestRunner:
     
     def create_test_database(self):
         """Create test database with sample data"""
-        conn = sqlite3.connect(self.test_db_path)
+        conn = self._conn
         cursor = conn.cursor()
         
         # Create problems table
@@ -147,12 +190,13 @@ class TestRunner:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', sample_problems)
         
-        # Insert sample progress
+        # Insert sample progress, all offsets relative to one timestamp
+        base = datetime.now()
         sample_progress = [
-            (1, "completed", "python", 1200, 1, "Solved using hash map", datetime.now() - timedelta(days=1)),
-            (2, "completed", "python", 1800, 2, "Tricky edge cases", datetime.now() - timedelta(days=2)),
-            (3, "completed", "python", 2400, 1, "Sliding window approach", datetime.now() - timedelta(days=3)),
-            (5, "completed", "python", 900, 1, "Stack-based solution", datetime.now() - timedelta(days=4))
+            (1, "completed", "python", 1200, 1, "Solved using hash map", base - timedelta(days=1)),
+            (2, "completed", "python", 1800, 2, "Tricky edge cases", base - timedelta(days=2)),
+            (3, "completed", "python", 2400, 1, "Sliding window approach", base - timedelta(days=3)),
+            (5, "completed", "python", 900, 1, "Stack-based solution", base - timedelta(days=4))
         ]
         
         cursor.executemany('''
@@ -161,28 +205,37 @@ class TestRunner:
         ''', sample_progress)
         
         conn.commit()
-        conn.close()
         print("✅ Test database created with sample data")
     
     def run_test(self, test_name, test_func, *args, **kwargs):
-        """Run a single test with error handling"""
+        """Run a single test with error handling, buffering its output"""
+        # A buffer local to this call captures everything printed while the
+        # test runs, including output from the modules under test, so it
+        # all lands after the test's header
+        buf = io.StringIO()
         try:
-            print(f"\n🔬 Testing: {test_name}")
-            result = test_func(*args, **kwargs)
+            with contextlib.redirect_stdout(buf):
+                print(f"\n🔬 Testing: {test_name}")
+                result = test_func(*args, **kwargs)
             
             if result:
-                print(f"✅ PASSED: {test_name}")
+                print(f"✅ PASSED: {test_name}", file=buf)
                 test_results['passed'] += 1
-                test_results['details'].append({'test': test_name, 'status': 'PASSED', 'message': 'Success'})
+                test_results['details'].append(TestDetail(test_name, 'PASSED', 'Success'))
             else:
-                print(f"❌ FAILED: {test_name}")
+                print(f"❌ FAILED: {test_name}", file=buf)
                 test_results['failed'] += 1
-                test_results['details'].append({'test': test_name, 'status': 'FAILED', 'message': 'Test returned False'})
+                test_results['details'].append(TestDetail(test_name, 'FAILED', 'Test returned False'))
                 
         except Exception as e:
-            print(f"❌ ERROR: {test_name} - {str(e)}")
+            print(f"❌ ERROR: {test_name} - {str(e)}", file=buf)
             test_results['failed'] += 1
-            test_results['details'].append({'test': test_name, 'status': 'ERROR', 'message': str(e)})
+            test_results['details'].append(TestDetail(test_name, 'ERROR', str(e)))
+        finally:
+            # One write per test instead of one per line
+            with output_lock:
+                sys.stdout.write(buf.getvalue())
+                sys.stdout.flush()
     
     def test_pwa_manager(self):
         """Test PWA Manager functionality"""
@@ -198,19 +251,19 @@ class TestRunner:
             
             # Test PWA status
             status = pwa.get_pwa_status()
-            
-            checks = [
-                status.get('name') == 'Coding Practice System',
-                status.get('version') == '2.0.0',
-                status.get('features', {}).get('offline_support') is True,
-                status.get('features', {}).get('push_notifications') is True
-            ]
+            features = status.get('features') or {}
             
             print(f"  📱 PWA Name: {status.get('name')}")
             print(f"  📱 Version: {status.get('version')}")
-            print(f"  📱 Features: {len(status.get('features', {}))}")
-            
-            return all(checks)
+            print(f"  📱 Features: {len(features)}")
+            
+            # Chained so evaluation stops at the first failing check
+            return (
+                status.get('name') == 'Coding Practice System'
+                and status.get('version') == '2.0.0'
+                and features.get('offline_support') is True
+                and features.get('push_notifications') is True
+            )
             
         except Exception as e:
             print(f"  ❌ PWA test error: {e}")
@@ -228,20 +281,21 @@ class TestRunner:
             
             # Test learning analytics
             report = analytics.get_learning_analytics("python", 30)
-            
-            checks = [
-                'learning_velocity' in report,
-                'skill_progression' in report,
-                'knowledge_gaps' in report,
-                'optimal_study_times' in report,
-                isinstance(report.get('learning_velocity', {}).get('velocity', 0), (int, float))
-            ]
-            
-            print(f"  📊 Velocity: {report.get('learning_velocity', {}).get('velocity', 0):.2f} problems/day")
-            print(f"  📊 Trend: {report.get('learning_velocity', {}).get('trend', 'unknown')}")
-            print(f"  📊 Analytics sections: {len([k for k in report.keys() if not k.startswith('error')])}")
-            
-            return all(checks) and 'error' not in report
+            velocity = report.get('learning_velocity') or {}
+            
+            print(f"  📊 Velocity: {velocity.get('velocity', 0):.2f} problems/day")
+            print(f"  📊 Trend: {velocity.get('trend', 'unknown')}")
+            print(f"  📊 Analytics sections: {sum(1 for k in report if not k.startswith('error'))}")
+            
+            # Chained so evaluation stops at the first failing check
+            return (
+                'error' not in report
+                and 'learning_velocity' in report
+                and 'skill_progression' in report
+                and 'knowledge_gaps' in report
+                and 'optimal_study_times' in report
+                and isinstance(velocity.get('velocity', 0), (int, float))
+            )
             
         except Exception as e:
             print(f"  ❌ Analytics test error: {e}")
@@ -255,6 +309,9 @@ class TestRunner:
             return False
         
         try:
+            # Only this test talks HTTP, so the client is imported here
+            import requests
+            
             # Create API instance
             api = self.modules['api'](db_path=str(self.test_db_path))
             
@@ -331,11 +388,15 @@ class TestRunner:
                 'attempts': 1
             })
             
-            # Get notifications
-            user_notifications = notifications.get_notifications("test_user", limit=10)
+            # Get notifications and achievements; both are read-only and open
+            # their own connections, so they can overlap on worker threads
+            async def fetch_user_state():
+                return await asyncio.gather(
+                    asyncio.to_thread(notifications.get_notifications, "test_user", limit=10),
+                    asyncio.to_thread(notifications.get_user_achievements, "test_user")
+                )
             
-            # Get achievements
-            user_achievements = notifications.get_user_achievements("test_user")
+            user_notifications, user_achievements = asyncio.run(fetch_user_state())
             
             print(f"  🔔 Notification sent: {'✅' if send_result else '❌'}")
             print(f"  🔔 Achievement check: {'✅' if isinstance(achievements, list) else '❌'}")
@@ -409,16 +470,8 @@ class TestRunner:
         """Test database integration across all components"""
         try:
             # Test database exists and has data
-            conn = sqlite3.connect(self.test_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM problems")
-            problem_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM progress")
-            progress_count = cursor.fetchone()[0]
-            
-            conn.close()
+            # Both counts in one statement and one round-trip
+            problem_count, progress_count = self._conn.execute(DB_COUNTS_QUERY).fetchone()
             
             print(f"  💾 Problems in DB: {problem_count}")
             print(f"  💾 Progress records: {progress_count}")
@@ -439,10 +492,13 @@ class TestRunner:
             'study_session_manager.py'
         ]
         
+        # One directory scan instead of a stat() per required file
+        with os.scandir(self.project_root) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+        
         all_exist = True
         for file in required_files:
-            file_path = self.project_root / file
-            exists = file_path.exists()
+            exists = file in present
             print(f"  📁 {file}: {'✅' if exists else '❌'}")
             if not exists:
                 all_exist = False
@@ -464,11 +520,10 @@ class TestRunner:
         total = len(dependencies)
         
         for dep, desc in dependencies.items():
-            try:
-                __import__(dep)
+            if is_module_available(dep):
                 print(f"  📦 {dep}: ✅ {desc}")
                 available += 1
-            except ImportError:
+            else:
                 print(f"  📦 {dep}: ⚠️  {desc} (optional)")
         
         print(f"  📦 Dependencies: {available}/{total} available")
@@ -532,15 +587,16 @@ class TestRunner:
         # Detailed results
         print("\n📋 DETAILED RESULTS:")
         for detail in test_results['details']:
-            status_emoji = "✅" if detail['status'] == 'PASSED' else "❌"
-            print(f"  {status_emoji} {detail['test']}: {detail['status']}")
-            if detail['status'] != 'PASSED' and detail['message'] != 'Success':
-                print(f"    └─ {detail['message']}")
+            passed = detail.status == 'PASSED'
+            print(f"  {'✅' if passed else '❌'} {detail.name}: {detail.status}")
+            if not passed and detail.message != 'Success':
+                print(f"    └─ {detail.message}")
 
 def main():
     """Main test runner"""
     runner = TestRunner()
     runner.run_all_tests()
+    runner.close()
     
     print(f"\n🏁 Test run completed at {datetime.now()}")
     
@@ -0,0 +1,38 @@
+"""
+Shared pytest configuration for the practice system tests
+Puts the project root on sys.path and provides fixtures used across test classes
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Test config, encoded once and written verbatim by every fixture
+_CONFIG_BYTES = json.dumps({
+    "languages": ["python", "javascript", "typescript"],
+    "current_language": "python",
+    "difficulty_preference": "mixed",
+    "topic_preference": "sequential",
+    "daily_goal": 3,
+    "review_interval": 7,
+    "auto_git": False  # Disable git for testing
+}).encode()
+
+
+@pytest.fixture
+def temp_db(tmp_path_factory):
+    """Create a temporary database for testing"""
+    # Numbered directory under the per-worker base temp dir, so pytest-xdist
+    # workers never share a parent
+    temp_dir = tmp_path_factory.mktemp("practice")
+    db_path = temp_dir / "test_problems.db"
+    config_path = temp_dir / "config.json"
+    
+    config_path.write_bytes(_CONFIG_BYTES)
+    
+    # pytest removes the base temp dir itself, so no teardown is needed
+    yield temp_dir, str(db_path), str(config_path)
@@ -6,92 +6,105 @@ Tests all core functionality including database operations, problem management,
 
 import pytest
 import sqlite3
-import tempfile
 import os
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
-
-# Import the modules to test
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Project root is put on sys.path by conftest.py
 from practice import PracticeManager
 
+# Timestamp bound as a plain string so inserts skip the datetime adapter
+_NOW_ISO = datetime.now().isoformat(sep=' ')
+
+_EXPECTED_PROBLEM_COLUMNS = frozenset({
+    'id', 'title', 'slug', 'difficulty', 'topic', 'platform',
+    'description', 'examples', 'constraints', 'hints', 'url', 'tags', 'created_at'
+})
+
+# Indexes behind the topic/difficulty filters and progress lookups by problem
+_EXPECTED_INDEXES = frozenset({
+    'idx_problems_topic', 'idx_problems_difficulty', 'idx_progress_problem_language'
+})
+
+
+@pytest.fixture(scope="session")
+def seeded_template(tmp_path_factory):
+    """Build the schema and seed problems once per session as an in-memory template"""
+    template_dir = tmp_path_factory.mktemp("template")
+    
+    # Bare instance without running __init__
+    builder = object.__new__(PracticeManager)
+    builder.db_path = template_dir / "template.db"
+    builder.init_database()
+    builder._add_basic_problems()
+    
+    template = sqlite3.connect(":memory:", check_same_thread=False)
+    source = sqlite3.connect(builder.db_path)
+    source.backup(template)
+    source.close()
+    
+    yield template
+    
+    template.close()
+
+
 class TestPracticeManager:
     """Test suite for PracticeManager class"""
     
     @pytest.fixture
-    def temp_db(self):
-        """Create a temporary database for testing"""
-        temp_dir = tempfile.mkdtemp()
-        db_path = os.path.join(temp_dir, "test_problems.db")
-        config_path = os.path.join(temp_dir, "config.json")
-        
-        # Create test config
-        config = {
-            "languages": ["python", "javascript", "typescript"],
-            "current_language": "python",
-            "difficulty_preference": "mixed",
-            "topic_preference": "sequential",
-            "daily_goal": 3,
-            "review_interval": 7,
-            "auto_git": False  # Disable git for testing
-        }
-        
-        with open(config_path, 'w') as f:
-            json.dump(config, f)
-        
-        yield temp_dir, db_path, config_path
-        
-        # Cleanup
-        if os.path.exists(db_path):
-            os.remove(db_path)
-        if os.path.exists(config_path):
-            os.remove(config_path)
-        os.rmdir(temp_dir)
-    
-    @pytest.fixture
-    def manager(self, temp_db):
+    def manager(self, temp_db, seeded_template):
         """Create a PracticeManager instance with temporary database"""
         temp_dir, db_path, config_path = temp_db
         
-        # Mock the paths
-        with patch.object(PracticeManager, '__init__', lambda self: None):
-            manager = PracticeManager()
-            manager.root_dir = Path(temp_dir)
-            manager.db_path = db_path
-            manager.config_path = config_path
-            manager.progress_path = os.path.join(temp_dir, "progress.json")
-            manager.ensure_directories()
-            manager.init_database()
-            manager.load_config()
-            
+        # Bare instance without running __init__, pointed at the temp paths
+        manager = object.__new__(PracticeManager)
+        manager.root_dir = Path(temp_dir)
+        manager.db_path = Path(db_path)
+        manager.config_path = Path(config_path)
+        manager.progress_path = Path(temp_dir) / "progress.json"
+        manager.ensure_directories()
+        
+        # Page-copy the pre-built schema and seed rather than re-running DDL
+        conn = sqlite3.connect(db_path)
+        # Throwaway database: skip journaling and fsync during the copy
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
+        seeded_template.backup(conn)
+        conn.close()
+        
+        manager.load_config()
+        
         return manager
     
-    def test_database_initialization(self, manager):
+    @pytest.fixture
+    def db_conn(self, manager):
+        """Single autocommit connection to the manager's database for the whole test"""
+        conn = sqlite3.connect(manager.db_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        yield conn
+        conn.close()
+    
+    def test_database_initialization(self, manager, db_conn):
         """Test database tables are created correctly"""
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
-        # Check if tables exist
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
+        # Tables and indexes in one pass over the schema
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')")
+        schema = cursor.fetchall()
+        tables = {name for kind, name in schema if kind == 'table'}
+        indexes = {name for kind, name in schema if kind == 'index'}
         
-        assert 'problems' in tables
-        assert 'progress' in tables
+        assert {'problems', 'progress'} <= tables
         
         # Check problems table structure
-        cursor.execute("PRAGMA table_info(problems)")
-        columns = [row[1] for row in cursor.fetchall()]
-        expected_columns = ['id', 'title', 'slug', 'difficulty', 'topic', 'platform', 
-                          'description', 'examples', 'constraints', 'hints', 'url', 'tags', 'created_at']
+        cursor.execute("SELECT name FROM pragma_table_info('problems')")
+        columns = {row[0] for row in cursor.fetchall()}
         
-        for col in expected_columns:
-            assert col in columns
+        assert _EXPECTED_PROBLEM_COLUMNS <= columns
         
-        conn.close()
+        # Filter queries must hit the same indexes as production
+        assert _EXPECTED_INDEXES <= indexes
     
     def test_config_loading(self, manager):
         """Test configuration loading"""
@@ -99,17 +112,16 @@ class TestPracticeManager:
         assert manager.config['daily_goal'] == 3
         assert 'python' in manager.config['languages']
     
-    def test_add_basic_problems(self, manager):
+    def test_add_basic_problems(self, manager, db_conn):
         """Test adding basic problems to database"""
         manager._add_basic_problems()
         
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         cursor.execute("SELECT COUNT(*) FROM problems")
         count = cursor.fetchone()[0]
         
-        assert count > 0  # Should have added some problems
+        assert count  # Should have added some problems
         
         # Check problem structure
         cursor.execute("SELECT * FROM problems LIMIT 1")
@@ -117,8 +129,6 @@ class TestPracticeManager:
         
         assert problem is not None
         assert len(problem) >= 7  # Should have all required fields
-        
-        conn.close()
     
     def test_get_next_problem(self, manager):
         """Test problem selection functionality"""
@@ -141,7 +151,7 @@ class TestPracticeManager:
         if problem:
             assert problem['difficulty'] == 'easy'
     
-    def test_problem_completion(self, manager):
+    def test_problem_completion(self, manager, db_conn):
         """Test problem completion tracking"""
         manager._add_basic_problems()
         
@@ -156,8 +166,7 @@ class TestPracticeManager:
         manager.complete_problem(notes="Test solution", time_spent=15)
         
         # Check if progress was recorded
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         cursor.execute("SELECT * FROM progress WHERE problem_id = ?", (problem['id'],))
         progress = cursor.fetchone()
@@ -166,16 +175,13 @@ class TestPracticeManager:
         assert progress[3] == 'completed'  # status
         assert progress[5] == 15  # time_spent
         assert progress[7] == "Test solution"  # notes
-        
-        conn.close()
     
-    def test_statistics_generation(self, manager):
+    def test_statistics_generation(self, manager, db_conn):
         """Test statistics generation"""
         manager._add_basic_problems()
         
         # Add some progress data
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         # Get a problem ID
         cursor.execute("SELECT id FROM problems LIMIT 1")
@@ -185,10 +191,7 @@ class TestPracticeManager:
         cursor.execute('''
             INSERT INTO progress (problem_id, language, status, completed_at, time_spent, notes)
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (problem_id, 'python', 'completed', datetime.now(), 20, 'Test notes'))
-        
-        conn.commit()
-        conn.close()
+        ''', (problem_id, 'python', 'completed', _NOW_ISO, 20, 'Test notes'))
         
         # Test statistics (should not raise exception)
         try:
@@ -218,13 +221,12 @@ class TestPracticeManager:
         except Exception as e:
             pytest.fail(f"Problem listing with difficulty filter failed: {e}")
     
-    def test_data_export(self, manager):
+    def test_data_export(self, manager, db_conn):
         """Test data export functionality"""
         manager._add_basic_problems()
         
         # Add some progress data
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         cursor.execute("SELECT id FROM problems LIMIT 1")
         problem_id = cursor.fetchone()[0]
@@ -232,10 +234,7 @@ class TestPracticeManager:
         cursor.execute('''
             INSERT INTO progress (problem_id, language, status, completed_at, time_spent)
             VALUES (?, ?, ?, ?, ?)
-        ''', (problem_id, 'python', 'completed', datetime.now(), 25))
-        
-        conn.commit()
-        conn.close()
+        ''', (problem_id, 'python', 'completed', _NOW_ISO, 25))
         
         # Test JSON export
         temp_file = os.path.join(manager.root_dir, "test_export.json")
@@ -244,24 +243,22 @@ class TestPracticeManager:
             assert os.path.exists(temp_file)
             
             # Verify export content
-            with open(temp_file, 'r') as f:
-                data = json.load(f)
-                assert 'problems' in data
-                assert 'progress' in data
-                assert len(data['problems']) > 0
+            data = json.loads(Path(temp_file).read_bytes())
+            assert 'problems' in data
+            assert 'progress' in data
+            assert data['problems']
         except Exception as e:
             pytest.fail(f"Data export failed: {e}")
         finally:
             if os.path.exists(temp_file):
                 os.remove(temp_file)
     
-    def test_progress_reset(self, manager):
+    def test_progress_reset(self, manager, db_conn):
         """Test progress reset functionality"""
         manager._add_basic_problems()
         
         # Add some progress data
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        cursor = db_conn.cursor()
         
         cursor.execute("SELECT id FROM problems LIMIT 1")
         problem_id = cursor.fetchone()[0]
@@ -269,36 +266,24 @@ class TestPracticeManager:
         cursor.execute('''
             INSERT INTO progress (problem_id, language, status, completed_at)
             VALUES (?, ?, ?, ?)
-        ''', (problem_id, 'python', 'completed', datetime.now()))
-        
-        conn.commit()
+        ''', (problem_id, 'python', 'completed', _NOW_ISO))
         
         # Verify progress exists
         cursor.execute("SELECT COUNT(*) FROM progress")
         count_before = cursor.fetchone()[0]
-        assert count_before > 0
-        
-        conn.close()
+        assert count_before
         
         # Reset progress
         manager.reset_data(progress=True, all=False, confirm=True)
         
-        # Verify progress was reset
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM progress")
-        count_after = cursor.fetchone()[0]
+        # Verify progress was reset while problems still exist, in one
+        # statement on the same autocommit connection
+        cursor.execute("SELECT (SELECT COUNT(*) FROM progress), (SELECT COUNT(*) FROM problems)")
+        count_after, problems_count = cursor.fetchone()
         assert count_after == 0
-        
-        # Problems should still exist
-        cursor.execute("SELECT COUNT(*) FROM problems")
-        problems_count = cursor.fetchone()[0]
-        assert problems_count > 0
-        
-        conn.close()
+        assert problems_count
     
-    def test_language_switching(self, manager):
+    def test_language_switching(self, manager, db_conn):
         """Test language switching functionality"""
         original_lang = manager.config['current_language']
         
@@ -315,16 +300,13 @@ class TestPracticeManager:
             manager.complete_problem(notes="JS solution")
             
             # Verify language was recorded
-            conn = sqlite3.connect(manager.db_path)
-            cursor = conn.cursor()
+            cursor = db_conn.cursor()
             
             cursor.execute("SELECT language FROM progress WHERE problem_id = ?", (problem['id'],))
             recorded_lang = cursor.fetchone()
             
             if recorded_lang:
                 assert recorded_lang[0] == 'javascript'
-            
-            conn.close()
         
         # Restore original language
         manager.config['current_language'] = original_lang
@@ -347,57 +329,43 @@ class TestPracticeManager:
         except Exception:
             pass  # Expected to fail
     
-    @pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
-    def test_difficulty_filtering(self, manager, difficulty):
-        """Test problem filtering by difficulty"""
+    def test_filtering(self, manager):
+        """Test problem filtering by difficulty and topic against one database"""
         manager._add_basic_problems()
         
-        problem = manager.get_next_problem(difficulty=difficulty)
-        if problem:  # Only test if problems of this difficulty exist
-            assert problem['difficulty'] == difficulty
-    
-    @pytest.mark.parametrize("topic", ["arrays", "strings", "trees", "graphs"])
-    def test_topic_filtering(self, manager, topic):
-        """Test problem filtering by topic"""
-        manager._add_basic_problems()
+        for difficulty in ("easy", "medium", "hard"):
+            problem = manager.get_next_problem(difficulty=difficulty)
+            if problem:  # Only test if problems of this difficulty exist
+                assert problem['difficulty'] == difficulty
         
-        problem = manager.get_next_problem(topic=topic)
-        if problem:  # Only test if problems of this topic exist
-            assert problem['topic'] == topic
+        for topic in ("arrays", "strings", "trees", "graphs"):
+            problem = manager.get_next_problem(topic=topic)
+            if problem:  # Only test if problems of this topic exist
+                assert problem['topic'] == topic
     
-    def test_concurrent_access(self, manager):
-        """Test concurrent database access"""
+    def test_concurrent_access(self, manager, db_conn):
+        """Test batched writes alongside manager reads"""
         manager._add_basic_problems()
         
-        # Simulate concurrent access
-        import threading
-        
-        def complete_problem_thread():
-            problem = manager.get_next_problem()
-            if problem:
-                manager.current_problem = problem
-                manager.complete_problem(notes="Concurrent test")
-        
-        threads = []
-        for i in range(3):
-            thread = threading.Thread(target=complete_problem_thread)
-            threads.append(thread)
-            thread.start()
+        cursor = db_conn.cursor()
+        cursor.execute("SELECT id FROM problems LIMIT 1")
+        problem_id = cursor.fetchone()[0]
         
-        for thread in threads:
-            thread.join()
+        # Three attempts written as one deterministic batch in an explicit transaction
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany('''
+            INSERT INTO progress (problem_id, language, status, completed_at, notes)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(problem_id, 'python', 'completed', _NOW_ISO, f"Batch attempt {i}") for i in range(3)])
+        cursor.execute("COMMIT")
         
-        # Verify no database corruption
-        conn = sqlite3.connect(manager.db_path)
-        cursor = conn.cursor()
+        # The manager's own connections must see a consistent database
+        assert manager.get_next_problem() is not None
         
         cursor.execute("SELECT COUNT(*) FROM progress")
         count = cursor.fetchone()[0]
         
-        # Should have some progress entries
-        assert count >= 0
-        
-        conn.close()
+        assert count == 3
 
 
 class TestIntegration:
@@ -407,16 +375,15 @@ class TestIntegration:
         """Test complete workflow from setup to completion"""
         temp_dir, db_path, config_path = temp_db
         
-        # Initialize manager
-        with patch.object(PracticeManager, '__init__', lambda self: None):
-            manager = PracticeManager()
-            manager.root_dir = Path(temp_dir)
-            manager.db_path = db_path
-            manager.config_path = config_path
-            manager.progress_path = os.path.join(temp_dir, "progress.json")
-            manager.ensure_directories()
-            manager.init_database()
-            manager.load_config()
+        # Initialize manager without running __init__
+        manager = object.__new__(PracticeManager)
+        manager.root_dir = Path(temp_dir)
+        manager.db_path = Path(db_path)
+        manager.config_path = Path(config_path)
+        manager.progress_path = Path(temp_dir) / "progress.json"
+        manager.ensure_directories()
+        manager.init_database()
+        manager.load_config()
         
         # 1. Setup problems
         manager._add_basic_problems()
@@ -441,10 +408,8 @@ class TestIntegration:
         assert os.path.exists(export_file)
         
         # 6. Verify export content
-        with open(export_file, 'r') as f:
-            data = json.load(f)
-            assert len(data['progress']) > 0
-            assert data['progress'][0]['status'] == 'completed'
+        data = json.loads(Path(export_file).read_bytes())
+        assert data['progress'] and data['progress'][0]['status'] == 'completed'
 
 
 if __name__ == "__main__":
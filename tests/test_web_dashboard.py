@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the web dashboard's data layer
+Covers DashboardManager against a temporary practice database
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_socketio")
+
+# Project root is put on sys.path by conftest.py
+from practice import PracticeManager
+from web_dashboard import DashboardManager
+
+
+def _init_practice_db(db_path):
+    """Create the practice tables the way practice.py does"""
+    # Bare instance without running __init__
+    builder = object.__new__(PracticeManager)
+    builder.db_path = db_path
+    builder.init_database()
+
+
+class TestDashboardManager:
+    """Test suite for DashboardManager"""
+    
+    def test_schema_recovers_once_database_initialized(self, temp_db):
+        """A dashboard started before the practice tables exist works once they do"""
+        _, db_path, _ = temp_db
+        manager = DashboardManager(db_path)
+        
+        with pytest.raises(sqlite3.OperationalError):
+            manager.data_version()
+        
+        _init_practice_db(db_path)
+        
+        assert manager.data_version() == 0
+        stats = manager.get_dashboard_stats("python", fresh=True)
+        assert stats['topic_stats'] == []
+        assert stats['recent_activity'] == []
@@ -6,232 +6,1134 @@ Real-time analytics, interactive charts, and modern UI
 
 import sqlite3
 import json
+import contextlib
+import queue
+import hashlib
+import gzip
 import os
+import sys
+import threading
+import time
+import functools
+import importlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Dict, List, Optional
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from flask_socketio import SocketIO, emit
-import plotly.graph_objs as go
-import plotly.utils
-import pandas as pd
+from flask import Flask, render_template_string, request, redirect, url_for, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room, leave_room
+from werkzeug.exceptions import HTTPException, InternalServerError
 
 try:
-    from recommendation_engine import RecommendationEngine
-    from spaced_repetition import SpacedRepetitionManager
-    from progress_visualizer import ProgressVisualizer
+    import orjson
 except ImportError:
-    print("⚠️  Some modules not found. Limited functionality.")
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+def _socketio_async_mode():
+    """gevent when the process has been monkey-patched (see wsgi.py), else threading
+    
+    Left to auto-detection, Flask-SocketIO picks gevent whenever it is
+    installed, even in an unpatched dev run where the blocking SQLite
+    calls and worker threads would then stall its event loop.
+    """
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('socket'):
+        return 'gevent'
+    return 'threading'
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, async_mode=_socketio_async_mode(), cors_allowed_origins="*")
+
+# Compress API responses on the fly. The page and script are precompressed
+# once at maximum quality and already carry Content-Encoding, which
+# flask-compress leaves alone; the export stays a plain stream
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_MIN_SIZE'] = 512
+    app.config['COMPRESS_STREAMS'] = False
+    Compress(app)
+
+# Dashboard stats are served from cache while fresh, and served stale
+# (with a background refresh) for a further grace period after that.
+# Entries are keyed on the data version, so a write is seen at once
+STATS_TTL = 300
+STATS_STALE_TTL = 600
+# Keys include the client-supplied window, so the cache is bounded (LRU)
+STATS_CACHE_SIZE = 64
+
+RECENT_ACTIVITY_LIMIT = 10
+
+# Per-language completed counts by topic, kept current by triggers on
+# progress so the topic distribution is a lookup rather than a JOIN and
+# GROUP BY over the whole history. Rebuilt from progress when the dashboard
+# first connects, which also heals any drift from writes made before the
+# triggers existed
+TOPIC_SUMMARY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS topic_summary (
+        language TEXT NOT NULL,
+        topic TEXT NOT NULL,
+        completed_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (language, topic)
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS trg_topic_summary_insert
+    AFTER INSERT ON progress WHEN NEW.status = 'completed'
+    BEGIN
+        INSERT INTO topic_summary (language, topic, completed_count)
+        SELECT NEW.language, p.topic, 1 FROM problems p WHERE p.id = NEW.problem_id
+        ON CONFLICT (language, topic) DO UPDATE SET completed_count = completed_count + 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_topic_summary_update_old
+    AFTER UPDATE OF status, language, problem_id ON progress WHEN OLD.status = 'completed'
+    BEGIN
+        UPDATE topic_summary SET completed_count = completed_count - 1
+        WHERE language = OLD.language
+        AND topic = (SELECT topic FROM problems WHERE id = OLD.problem_id);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_topic_summary_update_new
+    AFTER UPDATE OF status, language, problem_id ON progress WHEN NEW.status = 'completed'
+    BEGIN
+        INSERT INTO topic_summary (language, topic, completed_count)
+        SELECT NEW.language, p.topic, 1 FROM problems p WHERE p.id = NEW.problem_id
+        ON CONFLICT (language, topic) DO UPDATE SET completed_count = completed_count + 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_topic_summary_delete
+    AFTER DELETE ON progress WHEN OLD.status = 'completed'
+    BEGIN
+        UPDATE topic_summary SET completed_count = completed_count - 1
+        WHERE language = OLD.language
+        AND topic = (SELECT topic FROM problems WHERE id = OLD.problem_id);
+    END;
+    
+    -- Replaced by the incremental trg_topic_summary_problem_retopic
+    DROP TRIGGER IF EXISTS trg_topic_summary_problem_topic;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_topic_summary_problem_retopic
+    AFTER UPDATE OF topic ON problems WHEN OLD.topic IS NOT NEW.topic
+    BEGIN
+        UPDATE topic_summary SET completed_count = completed_count - (
+            SELECT COUNT(*) FROM progress
+            WHERE problem_id = NEW.id AND status = 'completed'
+            AND language = topic_summary.language)
+        WHERE topic = OLD.topic;
+        INSERT INTO topic_summary (language, topic, completed_count)
+        SELECT language, NEW.topic, COUNT(*) FROM progress
+        WHERE problem_id = NEW.id AND status = 'completed'
+        GROUP BY language
+        ON CONFLICT (language, topic) DO UPDATE
+        SET completed_count = completed_count + excluded.completed_count;
+    END;
+'''
+
+# Backfill for a freshly created topic_summary; the triggers keep it
+# current from then on
+TOPIC_SUMMARY_REBUILD = '''
+    BEGIN IMMEDIATE;
+    DELETE FROM topic_summary;
+    INSERT INTO topic_summary (language, topic, completed_count)
+    SELECT pr.language, p.topic, COUNT(*)
+    FROM progress pr
+    JOIN problems p ON pr.problem_id = p.id
+    WHERE pr.status = 'completed'
+    GROUP BY pr.language, p.topic;
+    COMMIT;
+'''
+
+# A single counter bumped by any write to the practice tables, so readers
+# can tell whether anything changed with one primary-key lookup
+DATA_VERSION_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS dashboard_data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        version INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO dashboard_data_version (id, version) VALUES (0, 0);
+    
+    CREATE TRIGGER IF NOT EXISTS trg_data_version_progress_insert
+    AFTER INSERT ON progress
+    BEGIN
+        UPDATE dashboard_data_version SET version = version + 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_data_version_progress_update
+    AFTER UPDATE ON progress
+    BEGIN
+        UPDATE dashboard_data_version SET version = version + 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_data_version_progress_delete
+    AFTER DELETE ON progress
+    BEGIN
+        UPDATE dashboard_data_version SET version = version + 1;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS trg_data_version_problems_update
+    AFTER UPDATE ON problems
+    BEGIN
+        UPDATE dashboard_data_version SET version = version + 1;
+    END;
+'''
+
+SQL_DATA_VERSION = 'SELECT version FROM dashboard_data_version WHERE id = 0'
+
+# Connections shared by the request, refresh and background threads; a
+# caller waits for one to come back once this many are checked out
+SQL_POOL_SIZE = 8
+# Prepared statements kept per connection
+SQL_CACHED_STATEMENTS = 256
+# Read the database through a memory map instead of read() calls into the
+# page cache; the practice database is far smaller than this
+SQL_MMAP_SIZE = 256 * 1024 * 1024
+
+# Problems (with their progress rows) read and encoded per page when
+# streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+DASHBOARD_SECTIONS = frozenset({'basic_stats', 'daily_progress', 'topic_stats', 'recent_activity'})
+
+# Composite indexes for the dashboard's hot paths: completed rows per problem
+# (joins back to problems) and completed rows per language ordered by
+# completion time, which the windowed stats, daily progress and recent
+# activity queries all range-seek
+DASHBOARD_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS ix_progress_problem_status ON progress(problem_id, status)',
+    'CREATE INDEX IF NOT EXISTS ix_progress_status_language_completed '
+    'ON progress(status, language, completed_at DESC)',
+)
+
+# Indexes earlier versions created that no query uses any more; dropped so
+# writes stop maintaining them. ix_progress_status_language_completed covers
+# the status-only prefix and the queries bucket days with SUBSTR, not DATE()
+DASHBOARD_RETIRED_INDEXES = (
+    'DROP INDEX IF EXISTS ix_progress_status_completed',
+    'DROP INDEX IF EXISTS ix_progress_completed_date',
+)
+
+# Dashboard queries are module-level constants so every call hands sqlite3
+# the same SQL text and hits the connection's prepared statement cache.
+# completed_at holds ISO timestamps, so the day bucket is its first ten
+# characters; SUBSTR avoids parsing every row as DATE() would
+_RECENT_WINDOW = '''
+    WITH recent AS MATERIALIZED (
+        SELECT pr.problem_id, pr.time_spent, p.difficulty, p.topic,
+               SUBSTR(pr.completed_at, 1, 10) as day
+        FROM progress pr
+        JOIN problems p ON pr.problem_id = p.id
+        WHERE pr.status = 'completed' AND pr.language = ?
+        AND pr.completed_at >= ?
+    )
+'''
+_BASIC_STATS_SELECT = '''
+    SELECT 
+        'basic' as kind,
+        COUNT(DISTINCT problem_id) as completed,
+        AVG(time_spent) as avg_time,
+        COUNT(CASE WHEN difficulty = 'easy' THEN 1 END) as easy,
+        COUNT(CASE WHEN difficulty = 'medium' THEN 1 END) as medium,
+        COUNT(CASE WHEN difficulty = 'hard' THEN 1 END) as hard,
+        COUNT(DISTINCT topic) as unique_topics
+    FROM recent
+'''
+SQL_WINDOWED_STATS = _RECENT_WINDOW + _BASIC_STATS_SELECT + '''
+    UNION ALL
+    SELECT 'daily', day, COUNT(*), NULL, NULL, NULL, NULL
+    FROM recent
+    GROUP BY day
+    ORDER BY 1, 2
+'''
+SQL_BASIC_STATS = _RECENT_WINDOW + _BASIC_STATS_SELECT
+# Daily counts on their own need no problem columns, so they are read
+# straight off the (status, language, completed_at) index
+SQL_DAILY_PROGRESS = '''
+    SELECT SUBSTR(completed_at, 1, 10) as day, COUNT(*) as count
+    FROM progress
+    WHERE status = 'completed' AND language = ? AND completed_at >= ?
+    GROUP BY day
+    ORDER BY day
+'''
+
+SQL_TOPIC_STATS = '''
+    SELECT topic, completed_count as count
+    FROM topic_summary
+    WHERE language = ? AND completed_count > 0
+    ORDER BY count DESC
+'''
+
+_RECENT_ACTIVITY_TEMPLATE = '''
+    SELECT pr.id, p.title, p.difficulty, p.topic, pr.completed_at,
+           SUBSTR(pr.completed_at, 1, 10) as completed_on, pr.time_spent
+    FROM progress pr
+    JOIN problems p ON pr.problem_id = p.id
+    WHERE pr.status = 'completed' AND pr.language = ?
+    {keyset}
+    ORDER BY pr.completed_at DESC, pr.id DESC
+    LIMIT ?
+'''
+SQL_RECENT_ACTIVITY = _RECENT_ACTIVITY_TEMPLATE.format(keyset='')
+SQL_RECENT_ACTIVITY_PAGE = _RECENT_ACTIVITY_TEMPLATE.format(
+    keyset='AND (pr.completed_at, pr.id) < (?, ?)')
+
+# One page of the export: the next EXPORT_BATCH_SIZE problems after a
+# problem id (a keyset seek on the rowid) with their progress rows
+SQL_EXPORT_PAGE = '''
+    SELECT p.id, p.title, p.slug, p.difficulty, p.topic, p.platform,
+           p.description, p.examples, p.constraints, p.hints, p.url, p.tags,
+           pr.status, pr.completed_at, pr.time_spent, pr.notes
+    FROM (SELECT * FROM problems WHERE id > ? ORDER BY id LIMIT ?) p
+    LEFT JOIN progress pr ON p.id = pr.problem_id AND pr.language = ?
+    ORDER BY p.id, pr.id
+'''
+
+@functools.lru_cache(maxsize=None)
+def _optional_class(module, name):
+    """Import an engine class on first use rather than at startup
+    
+    Returns None (once warned) when the module is not available, so the
+    dashboard runs with limited functionality.
+    """
+    try:
+        return getattr(importlib.import_module(module), name)
+    except ImportError:
+        print(f"⚠️  {module} not found. Limited functionality.")
+        return None
+
+# The engines open their own connections; a write in progress elsewhere can
+# outlast sqlite3's 5 s busy timeout, so "database is locked" is retried
+# a few times with exponential backoff before giving up
+SQL_LOCK_RETRIES = 3
+SQL_LOCK_BACKOFF = 0.05
+
+def _retry_locked(func, *args):
+    """Call func, retrying sqlite3.OperationalError with exponential backoff"""
+    for attempt in range(SQL_LOCK_RETRIES):
+        try:
+            return func(*args)
+        except sqlite3.OperationalError:
+            if attempt == SQL_LOCK_RETRIES - 1:
+                raise
+            time.sleep(SQL_LOCK_BACKOFF * 2 ** attempt)
 
 class DashboardManager:
     def __init__(self, db_path="practice_data/problems.db"):
         self.db_path = db_path
+        self._idle_conns = queue.LifoQueue()
+        self._pool_slots = threading.BoundedSemaphore(SQL_POOL_SIZE)
+        self._stats_cache = OrderedDict()
+        self._refreshing = set()
+        self._cache_lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=1)
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+    
+    @contextlib.contextmanager
+    def _connection(self):
+        """Borrow a pooled connection for the duration of a with block
         
-    def get_dashboard_stats(self, language="python", days=30):
-        """Get comprehensive dashboard statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        At most SQL_POOL_SIZE connections exist; the most recently returned
+        one is handed out first so its page cache and prepared statements
+        stay warm.
+        """
+        self._pool_slots.acquire()
+        try:
+            try:
+                conn = self._idle_conns.get_nowait()
+            except queue.Empty:
+                conn = self._open_conn()
+        except BaseException:
+            self._pool_slots.release()
+            raise
+        try:
+            # Retried on every checkout until it succeeds, so a dashboard
+            # started before practice.py created the tables recovers
+            if not self._schema_ready:
+                self._ensure_schema(conn)
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            self._idle_conns.put(conn)
+            self._pool_slots.release()
+    
+    def _open_conn(self):
+        """Open and configure a new connection for the pool"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=SQL_CACHED_STATEMENTS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA mmap_size={SQL_MMAP_SIZE}')
+        return conn
+    
+    def _ensure_schema(self, conn):
+        """Create the dashboard indexes, data version and topic summary once the practice tables exist"""
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            try:
+                for statement in DASHBOARD_INDEXES + DASHBOARD_RETIRED_INDEXES:
+                    conn.execute(statement)
+                conn.executescript(DATA_VERSION_SCHEMA)
+                created = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'topic_summary'"
+                ).fetchone() is None
+                conn.executescript(TOPIC_SUMMARY_SCHEMA)
+                if created:
+                    conn.executescript(TOPIC_SUMMARY_REBUILD)
+                    # Give the planner statistics to choose between the indexes
+                    conn.execute('ANALYZE')
+            except sqlite3.OperationalError:
+                # Database not initialized yet; retry on the next checkout
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                return
+            self._schema_ready = True
         
-        # Basic stats
-        cursor.execute('''
-            SELECT 
-                COUNT(DISTINCT pr.problem_id) as completed,
-                AVG(pr.time_spent) as avg_time,
-                COUNT(CASE WHEN p.difficulty = 'easy' THEN 1 END) as easy,
-                COUNT(CASE WHEN p.difficulty = 'medium' THEN 1 END) as medium,
-                COUNT(CASE WHEN p.difficulty = 'hard' THEN 1 END) as hard,
-                COUNT(DISTINCT p.topic) as unique_topics
-            FROM progress pr
-            JOIN problems p ON pr.problem_id = p.id
-            WHERE pr.status = 'completed' AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
-        '''.format(days), (language,))
+    def data_version(self):
+        """Return the practice data version, bumped on every progress write"""
+        with self._connection() as conn:
+            row = conn.execute(SQL_DATA_VERSION).fetchone()
+        return row[0] if row else 0
+    
+    def invalidate(self):
+        """Drop cached stats, e.g. to release entries for old data versions"""
+        with self._cache_lock:
+            self._stats_cache.clear()
+    
+    def get_dashboard_stats(self, language="python", days=30, sections=None, fresh=False):
+        """Get dashboard statistics (stale-while-revalidate)
         
-        basic_stats = cursor.fetchone()
+        sections limits the result to a subset of DASHBOARD_SECTIONS so
+        callers that need one part (e.g. a single chart) skip the other
+        queries; None returns every section. fresh=True bypasses the cache
+        for callers that memoize on data_version() themselves.
         
-        # Daily progress for chart
-        cursor.execute('''
-            SELECT DATE(pr.completed_at) as date, COUNT(*) as count
-            FROM progress pr
-            WHERE pr.status = 'completed' AND pr.language = ?
-            AND DATE(pr.completed_at) >= DATE('now', '-{} days')
-            GROUP BY DATE(pr.completed_at)
-            ORDER BY date
-        '''.format(days), (language,))
+        The cache key includes data_version(), so a practice write is never
+        hidden behind a cached or in-flight result from before it, whether
+        or not anything calls invalidate().
+        """
+        sections = DASHBOARD_SECTIONS if sections is None else frozenset(sections)
+        if fresh:
+            return self._query_dashboard_stats(language, days, sections)
+        key = (language, days, sections, self.data_version())
+        with self._cache_lock:
+            entry = self._stats_cache.get(key)
+            if entry is not None:
+                self._stats_cache.move_to_end(key)
+                stats, fresh_until = entry
+                now = time.monotonic()
+                if now < fresh_until:
+                    return stats
+                if now < fresh_until + STATS_STALE_TTL:
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._refresh_pool.submit(self._refresh_stats, key)
+                    return stats
         
-        daily_progress = cursor.fetchall()
+        return self._refresh_stats(key)
+    
+    def _refresh_stats(self, key):
+        """Recompute stats for a (language, days, sections, version) key and store them"""
+        try:
+            stats = self._query_dashboard_stats(*key[:3])
+            with self._cache_lock:
+                self._stats_cache[key] = (stats, time.monotonic() + STATS_TTL)
+                self._stats_cache.move_to_end(key)
+                while len(self._stats_cache) > STATS_CACHE_SIZE:
+                    self._stats_cache.popitem(last=False)
+            return stats
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(key)
+    
+    def _query_dashboard_stats(self, language, days, sections):
+        """Run the dashboard stats queries needed for the requested sections
         
-        # Topic distribution
-        cursor.execute('''
-            SELECT p.topic, COUNT(*) as count
-            FROM progress pr
-            JOIN problems p ON pr.problem_id = p.id
-            WHERE pr.status = 'completed' AND pr.language = ?
-            GROUP BY p.topic
-            ORDER BY count DESC
-        ''', (language,))
+        The queries share one read transaction, so every section sees the
+        same snapshot even if a practice session is recorded mid-way.
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            stats = {}
+            
+            cursor.execute('BEGIN')
+            try:
+                # A plain comparison against the first day of the window keeps
+                # completed_at usable as an index range; the stored ISO
+                # timestamps sort after their own date
+                cutoff = (datetime.now() - timedelta(days=days)).date().isoformat()
+                
+                # Basic stats and daily progress share one windowed scan when
+                # both are wanted (rows are tagged so both come back from a
+                # single statement); either alone gets its narrow query
+                if {'basic_stats', 'daily_progress'} <= sections:
+                    cursor.execute(SQL_WINDOWED_STATS, (language, cutoff))
+                
+                    rows = cursor.fetchall()
+                    stats['basic_stats'] = rows[0][1:]
+                    stats['daily_progress'] = [row[1:3] for row in rows[1:]]
+                elif 'basic_stats' in sections:
+                    cursor.execute(SQL_BASIC_STATS, (language, cutoff))
+                    stats['basic_stats'] = cursor.fetchone()[1:]
+                elif 'daily_progress' in sections:
+                    cursor.execute(SQL_DAILY_PROGRESS, (language, cutoff))
+                    stats['daily_progress'] = cursor.fetchall()
+                
+                # Topic distribution
+                if 'topic_stats' in sections:
+                    cursor.execute(SQL_TOPIC_STATS, (language,))
+                
+                    stats['topic_stats'] = cursor.fetchall()
+                
+                # Recent activity, returned with named columns
+                if 'recent_activity' in sections:
+                    stats['recent_activity'] = self._recent_activity(conn, language)
+            finally:
+                cursor.execute('COMMIT')
         
-        topic_stats = cursor.fetchall()
+        return stats
+    
+    def get_recent_activity(self, language="python", before=None, limit=RECENT_ACTIVITY_LIMIT):
+        """Get completed problems, newest first, one page at a time
         
-        # Recent activity
-        cursor.execute('''
-            SELECT p.title, p.difficulty, p.topic, pr.completed_at, pr.time_spent
-            FROM progress pr
-            JOIN problems p ON pr.problem_id = p.id
-            WHERE pr.status = 'completed' AND pr.language = ?
-            ORDER BY pr.completed_at DESC
-            LIMIT 10
-        ''', (language,))
+        before is the (completed_at, id) of the last row already shown; the
+        next page is read with a keyset seek on the completed_at index
+        rather than an OFFSET that rescans earlier pages.
+        """
+        with self._connection() as conn:
+            return self._recent_activity(conn, language, before, limit)
+    
+    def _recent_activity(self, conn, language, before=None, limit=RECENT_ACTIVITY_LIMIT):
+        """Read one page of recent activity on an already borrowed connection"""
+        sql = SQL_RECENT_ACTIVITY
+        params = [language]
+        if before is not None:
+            sql = SQL_RECENT_ACTIVITY_PAGE
+            params.extend(before)
+        params.append(limit)
         
-        recent_activity = cursor.fetchall()
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(sql, params)
         
-        conn.close()
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def export_data_stream(self, language="python"):
+        """Yield a JSON export of problems and progress, batch by batch
         
-        return {
-            'basic_stats': basic_stats,
-            'daily_progress': daily_progress,
-            'topic_stats': topic_stats,
-            'recent_activity': recent_activity
+        Same fields as PracticeManager.export_data's JSON export, but the
+        array is produced incrementally so a download never holds the whole
+        result set (or a temp file) at once.
+        
+        Each page is read on a short checkout that ends before it is
+        yielded, so a slow download neither ties up a pooled connection nor
+        keeps a read transaction open against WAL checkpoints.
+        """
+        last_id = 0
+        separator = b'['
+        while True:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(SQL_EXPORT_PAGE, (last_id, EXPORT_BATCH_SIZE, language))
+                rows = [dict(row) for row in cursor.fetchall()]
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+            # Encode the batch as an array and drop its brackets to splice it in
+            yield separator + _encode_json(rows)[1:-1]
+            separator = b','
+        yield b'[]' if separator == b'[' else b']'
+    
+    def get_dashboard_data(self, language="python", days=30):
+        """Fetch stats, recommendations and reviews concurrently"""
+        futures = {
+            'stats': self._executor.submit(self.get_dashboard_stats, language, days),
+            'recommendations': self._executor.submit(self.get_real_time_recommendations, language),
+            'reviews': self._executor.submit(self.get_review_dashboard, language),
         }
+        # Stats are the core of the dashboard; the engine-backed parts
+        # degrade to empty results rather than failing the whole response
+        fallbacks = {'recommendations': [], 'reviews': {'stats': {}, 'due_reviews': []}}
+        data = {}
+        for name, future in futures.items():
+            try:
+                data[name] = future.result()
+            except Exception as e:
+                if name not in fallbacks:
+                    raise
+                print(f"⚠️  Dashboard {name} unavailable: {e}")
+                data[name] = fallbacks[name]
+        return data
     
     def get_real_time_recommendations(self, language="python", count=5):
         """Get real-time problem recommendations"""
-        try:
-            engine = RecommendationEngine(self.db_path)
-            return engine.get_personalized_recommendations(language, count)
-        except:
+        engine_class = _optional_class('recommendation_engine', 'RecommendationEngine')
+        if engine_class is None:
             return []
+        engine = engine_class(self.db_path)
+        return _retry_locked(engine.get_personalized_recommendations, language, count)
     
     def get_review_dashboard(self, language="python"):
         """Get spaced repetition dashboard data"""
-        try:
-            sr_manager = SpacedRepetitionManager(self.db_path)
-            stats = sr_manager.get_review_statistics(language, 30)
-            due_reviews = sr_manager.get_due_reviews(language, 10)
-            return {
-                'stats': stats,
-                'due_reviews': due_reviews
-            }
-        except:
+        manager_class = _optional_class('spaced_repetition', 'SpacedRepetitionManager')
+        if manager_class is None:
             return {'stats': {}, 'due_reviews': []}
+        sr_manager = manager_class(self.db_path)
+        stats = _retry_locked(sr_manager.get_review_statistics, language, 30)
+        due_reviews = _retry_locked(sr_manager.get_due_reviews, language, 10)
+        return {
+            'stats': stats,
+            'due_reviews': due_reviews
+        }
 
 dashboard_manager = DashboardManager()
 
+# How long browsers may reuse a polled response before revalidating it
+API_MAX_AGE = 60
+# ...and may keep serving it for this much longer while revalidating
+API_STALE_WHILE_REVALIDATE = 300
+
+def _encode_json(obj):
+    """Serialize an API payload to bytes, with orjson when it is installed"""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches json.dumps for int/date-keyed dicts
+        # (e.g. review schedules) instead of raising TypeError
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+                            | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str).encode()
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson
+    
+    Covers what does not go through fast_json: jsonify, request.get_json
+    and Flask-SocketIO, which encodes emitted payloads via flask.json.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        return _encode_json(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+def fast_json(obj):
+    """Build a JSON response for an API payload"""
+    return app.response_class(_encode_json(obj), mimetype='application/json')
+
+def cached_json(body, etag=None):
+    """Build a cacheable JSON response for an encoded body
+    
+    The ETag defaults to a hash of the body, so polls that see unchanged
+    data get a 304 with no body instead of the full payload.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag or hashlib.blake2b(body, digest_size=8).hexdigest())
+    response.headers['Cache-Control'] = (
+        f'max-age={API_MAX_AGE}, stale-while-revalidate={API_STALE_WHILE_REVALIDATE}')
+    return response.make_conditional(request)
+
+@functools.lru_cache(maxsize=None)
+def _plotting():
+    """Import NumPy and Plotly on the first chart render, not at startup
+    
+    Figures set FIGURE_TEMPLATE themselves: the dashboard's chart styling
+    is sent to the browser once (see CHART_TEMPLATE) instead of being
+    embedded in every chart payload. Plotly's process-wide default is left
+    alone for other modules.
+    """
+    import numpy as np
+    import plotly.graph_objs as go
+    import plotly.io as pio
+    return np, go, pio
+
+# Built-in empty template, so serialized figures carry no styling
+FIGURE_TEMPLATE = 'none'
+
+CHART_TEMPLATE = 'plotly_white'
+
+@functools.lru_cache(maxsize=None)
+def _chart_template_json():
+    """Encode the shared chart template once"""
+    _, _, pio = _plotting()
+    return _encode_json(pio.templates[CHART_TEMPLATE].to_plotly_json())
+
+def _build_progress_figure():
+    """Build the daily progress line chart with an empty trace"""
+    _, go, _ = _plotting()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        mode='lines+markers',
+        name='Problems Solved',
+        line=dict(color='#4CAF50', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig.update_layout(
+        title='Daily Problem Solving Progress',
+        xaxis_title='Date',
+        yaxis_title='Problems Solved',
+        height=400,
+        template=FIGURE_TEMPLATE
+    )
+    return fig
+
+def _build_topic_figure():
+    """Build the topic distribution pie chart with an empty trace"""
+    _, go, _ = _plotting()
+    fig = go.Figure(data=[go.Pie(
+        hole=0.4,
+        textinfo='label+percent',
+        textposition='outside'
+    )])
+    
+    fig.update_layout(
+        title='Problems Solved by Topic',
+        height=400,
+        template=FIGURE_TEMPLATE
+    )
+    return fig
+
+# Figures are built once per chart type and only their trace data is
+# swapped per request; Plotly figures are not thread-safe, hence the lock
+_FIGURE_BUILDERS = {
+    'progress': _build_progress_figure,
+    'topic': _build_topic_figure,
+}
+_figures = {}
+_figure_lock = threading.Lock()
+
+def _chart_figure(chart_type):
+    """Return the reusable figure for a chart type (call with _figure_lock held)"""
+    fig = _figures.get(chart_type)
+    if fig is None:
+        fig = _figures[chart_type] = _FIGURE_BUILDERS[chart_type]()
+    return fig
+
+# The page only changes on deploy, so browsers may reuse it for this long
+# and then revalidate against the template hash
+PAGE_MAX_AGE = 300
+# The script URL changes with its content, so a matching URL never goes stale
+SCRIPT_MAX_AGE = 31536000
+# plotly.js is served from the installed plotly package, so it matches the
+# figures the server renders; the CDN build is only a fallback
+PLOTLY_CDN_URL = 'https://cdn.plot.ly/plotly-2.27.0.min.js'
+# plotly.js is a few MB; this level compresses it in well under a second,
+# within a few percent of the maximum
+PLOTLY_BROTLI_QUALITY = 9
+
+def _compress(body, brotli_quality=11):
+    """Compress a static body once, per supported encoding"""
+    encodings = {'gzip': gzip.compress(body, compresslevel=9)}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body, quality=brotli_quality)
+    return encodings
+
+def _encoded_response(body, encodings, mimetype, etag):
+    """Serve the best precompressed encoding the client accepts"""
+    for encoding in ('br', 'gzip'):
+        if encoding in encodings and request.accept_encodings[encoding]:
+            response = app.response_class(encodings[encoding], mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            etag = f'{etag}-{encoding}'
+            break
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+    
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    return response
+
+@functools.lru_cache(maxsize=None)
+def _dashboard_page():
+    """Render the dashboard page once, plus its compressed encodings
+    
+    Compression runs at maximum quality a single time per process instead
+    of on every page load.
+    """
+    script_url = url_for('dashboard_script', digest=_SCRIPT_DIGEST)
+    bundle = _plotly_bundle()
+    plotly_url = (url_for('plotly_script', digest=bundle[1]) if bundle is not None
+                  else PLOTLY_CDN_URL)
+    # Rendered from DASHBOARD_HTML in memory; templates/dashboard.html
+    # belongs to launch_dashboard.py
+    body = render_template_string(DASHBOARD_HTML.strip(), script_url=script_url,
+                                  plotly_url=plotly_url).encode('utf-8')
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return body, _compress(body), etag
+
+@functools.lru_cache(maxsize=None)
+def _dashboard_script():
+    """The page script and its compressed encodings"""
+    return _SCRIPT_BYTES, _compress(_SCRIPT_BYTES)
+
+@functools.lru_cache(maxsize=None)
+def _plotly_bundle():
+    """plotly.js from the installed plotly package and its content hash
+    
+    None when plotly is not installed, in which case the page loads the
+    CDN build instead.
+    """
+    try:
+        from plotly.offline import get_plotlyjs
+    except ImportError:
+        return None
+    body = get_plotlyjs().encode('utf-8')
+    return body, hashlib.sha256(body).hexdigest()[:10]
+
+@functools.lru_cache(maxsize=None)
+def _plotly_encodings():
+    """Compressed encodings of the bundled plotly.js"""
+    return _compress(_plotly_bundle()[0], brotli_quality=PLOTLY_BROTLI_QUALITY)
+
+def _asset_response(body, encodings, digest, requested_digest):
+    """Serve a script under a content-hashed URL
+    
+    A matching hash is cached as immutable; a stale one (a page cached
+    from before a deploy) gets the current script, uncached.
+    """
+    response = _encoded_response(body, encodings, 'text/javascript', digest)
+    if requested_digest == digest:
+        response.cache_control.public = True
+        response.cache_control.max_age = SCRIPT_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
     """Main dashboard page"""
-    return render_template('dashboard.html')
+    body, encodings, etag = _dashboard_page()
+    response = _encoded_response(body, encodings, 'text/html', etag)
+    response.cache_control.max_age = PAGE_MAX_AGE
+    return response.make_conditional(request)
+
+@app.route('/assets/dashboard.<digest>.js')
+def dashboard_script(digest):
+    """Page script under a content-hashed, immutable URL"""
+    body, encodings = _dashboard_script()
+    return _asset_response(body, encodings, _SCRIPT_DIGEST, digest)
+
+@app.route('/assets/plotly.<digest>.min.js')
+def plotly_script(digest):
+    """plotly.js bundled with the installed plotly package"""
+    bundle = _plotly_bundle()
+    if bundle is None:
+        return redirect(PLOTLY_CDN_URL)
+    body, current_digest = bundle
+    return _asset_response(body, _plotly_encodings(), current_digest, digest)
+
+# Request parameters are validated at the edge, so the caches keyed on them
+# have a bounded key space and bad input is a 400 rather than a 500
+DASHBOARD_LANGUAGES = frozenset({'python', 'javascript', 'typescript', 'react'})
+MAX_DAYS = 365
+MAX_COUNT = 50
+
+class InvalidQuery(ValueError):
+    """A request parameter outside what the dashboard serves"""
+
+def _language_param(args):
+    """Validated language from request args or a socket payload"""
+    language = args.get('language', 'python')
+    if language not in DASHBOARD_LANGUAGES:
+        raise InvalidQuery(f'Unsupported language: {language}')
+    return language
+
+def _int_param(args, name, default, maximum):
+    """Validated integer parameter in 1..maximum"""
+    try:
+        value = int(args.get(name, default))
+    except (TypeError, ValueError):
+        raise InvalidQuery(f'{name} must be an integer') from None
+    if not 1 <= value <= maximum:
+        raise InvalidQuery(f'{name} must be between 1 and {maximum}')
+    return value
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(error):
+    """Log unhandled errors; API callers get a JSON 500 instead of HTML"""
+    if isinstance(error, HTTPException):
+        return error
+    app.logger.exception('Unhandled error on %s', request.path)
+    if request.path.startswith('/api/'):
+        return fast_json({'error': 'Internal server error'}), 500
+    return InternalServerError(original_exception=error)
+
+@app.errorhandler(InvalidQuery)
+def handle_invalid_query(error):
+    """Reject invalid API parameters with a JSON 400"""
+    return fast_json({'error': str(error)}), 400
+
+@app.route('/api/dashboard')
+def api_dashboard():
+    """API endpoint for stats, recommendations and reviews in one response"""
+    language = _language_param(request.args)
+    days = _int_param(request.args, 'days', 30, MAX_DAYS)
+    
+    return cached_json(_encode_json(dashboard_manager.get_dashboard_data(language, days)))
 
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for dashboard statistics"""
-    language = request.args.get('language', 'python')
-    days = int(request.args.get('days', 30))
+    language = _language_param(request.args)
+    days = _int_param(request.args, 'days', 30, MAX_DAYS)
     
     stats = dashboard_manager.get_dashboard_stats(language, days)
-    return jsonify(stats)
+    return fast_json(stats)
+
+@app.route('/api/activity')
+def api_activity():
+    """API endpoint for paging through recent activity"""
+    language = _language_param(request.args)
+    before = None
+    if 'before_id' in request.args:
+        before = (request.args.get('before_at', ''),
+                  _int_param(request.args, 'before_id', 0, 2**63 - 1))
+    
+    return fast_json(dashboard_manager.get_recent_activity(language, before))
+
+@app.route('/api/export')
+def api_export():
+    """Stream a JSON export of problems and progress as a download"""
+    language = _language_param(request.args)
+    filename = f"practice_export_{datetime.now():%Y%m%d_%H%M%S}.json"
+    
+    return app.response_class(
+        stream_with_context(dashboard_manager.export_data_stream(language)),
+        mimetype='application/json',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 @app.route('/api/recommendations')
 def api_recommendations():
     """API endpoint for problem recommendations"""
-    language = request.args.get('language', 'python')
-    count = int(request.args.get('count', 5))
+    language = _language_param(request.args)
+    count = _int_param(request.args, 'count', 5, MAX_COUNT)
     
     recommendations = dashboard_manager.get_real_time_recommendations(language, count)
-    return jsonify(recommendations)
+    return fast_json(recommendations)
+
+@app.route('/api/chart-template')
+def api_chart_template():
+    """Layout template applied to every chart in the browser"""
+    return cached_json(_chart_template_json())
 
 @app.route('/api/reviews')
 def api_reviews():
     """API endpoint for spaced repetition data"""
-    language = request.args.get('language', 'python')
+    language = _language_param(request.args)
     
     review_data = dashboard_manager.get_review_dashboard(language)
-    return jsonify(review_data)
+    return fast_json(review_data)
 
-@app.route('/api/progress-chart')
-def api_progress_chart():
-    """Generate interactive progress chart"""
-    language = request.args.get('language', 'python')
-    days = int(request.args.get('days', 30))
-    
-    stats = dashboard_manager.get_dashboard_stats(language, days)
+EMPTY_CHART_JSON = json.dumps({'data': [], 'layout': {}})
+
+def _render_progress_chart(language, days):
+    """Encode the daily progress chart for a language/window as JSON"""
+    stats = dashboard_manager.get_dashboard_stats(language, days, {'daily_progress'}, fresh=True)
     daily_data = stats['daily_progress']
     
     if not daily_data:
-        return jsonify({'data': [], 'layout': {}})
-    
-    dates = [row[0] for row in daily_data]
-    counts = [row[1] for row in daily_data]
+        return EMPTY_CHART_JSON
     
-    # Create Plotly chart
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=dates,
-        y=counts,
-        mode='lines+markers',
-        name='Problems Solved',
-        line=dict(color='#4CAF50', width=3),
-        marker=dict(size=8)
-    ))
+    np, _, pio = _plotting()
+    # One pass into a preallocated structured array instead of a
+    # comprehension per column; the int32 counts stay a typed buffer
+    daily = np.fromiter(daily_data, dtype=[('date', 'U10'), ('count', 'i4')],
+                        count=len(daily_data))
+    dates = daily['date']
+    counts = daily['count']
     
-    fig.update_layout(
-        title='Daily Problem Solving Progress',
-        xaxis_title='Date',
-        yaxis_title='Problems Solved',
-        template='plotly_white',
-        height=400
-    )
-    
-    return jsonify(json.loads(plotly.utils.PlotlyJSONEncoder().encode(fig)))
+    with _figure_lock:
+        fig = _chart_figure('progress')
+        fig.data[0].update(x=dates, y=counts)
+        return pio.to_json(fig)
 
-@app.route('/api/topic-chart')
-def api_topic_chart():
-    """Generate topic distribution chart"""
-    language = request.args.get('language', 'python')
-    days = int(request.args.get('days', 30))
-    
-    stats = dashboard_manager.get_dashboard_stats(language, days)
+def _render_topic_chart(language, days):
+    """Encode the topic distribution chart for a language as JSON"""
+    stats = dashboard_manager.get_dashboard_stats(language, days, {'topic_stats'}, fresh=True)
     topic_data = stats['topic_stats']
     
     if not topic_data:
-        return jsonify({'data': [], 'layout': {}})
+        return EMPTY_CHART_JSON
     
-    topics = [row[0] for row in topic_data]
-    counts = [row[1] for row in topic_data]
+    np, _, pio = _plotting()
+    topic_counts = np.fromiter(topic_data, dtype=[('topic', object), ('count', 'i4')],
+                               count=len(topic_data))
+    topics = topic_counts['topic']
+    counts = topic_counts['count']
     
-    # Create Plotly pie chart
-    fig = go.Figure(data=[go.Pie(
-        labels=topics,
-        values=counts,
-        hole=0.4,
-        textinfo='label+percent',
-        textposition='outside'
-    )])
+    with _figure_lock:
+        fig = _chart_figure('topic')
+        fig.data[0].update(labels=topics, values=counts)
+        return pio.to_json(fig)
+
+# Encoded charts are memoized on the data version (and the day, since the
+# windows are relative to today), so a chart is rendered once per practice
+# write rather than once per request. A background task polls the version,
+# warms the keys that have been requested and pushes the new version to
+# connected browsers, which refetch only then
+DATA_VERSION_POLL_INTERVAL = 2
+CHART_CACHE_SIZE = 32
+_CHART_RENDERERS = {
+    'progress': _render_progress_chart,
+    'topic': _render_topic_chart,
+}
+# Most recently requested chart keys, capped like the memo so the warm-up
+# never renders more charts than the memo can hold
+_chart_keys = OrderedDict()
+_chart_keys_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_chart(chart_type, language, days, version, day):
+    """Render a chart once per (data version, day), as (etag, response-ready bytes)
     
-    fig.update_layout(
-        title='Problems Solved by Topic',
-        template='plotly_white',
-        height=400
-    )
+    The ETag hashes the body itself, so it differs across languages and
+    windows and never matches a figure from a recreated database or an
+    older render format.
+    """
+    body = _CHART_RENDERERS[chart_type](language, days).encode()
+    return hashlib.blake2b(body, digest_size=8).hexdigest(), body
+
+def _chart_version():
+    """Return the memo key part that changes whenever a chart can change"""
+    return dashboard_manager.data_version(), datetime.now().date()
+
+def _version_token(version, day):
+    """Opaque token for a (data version, day) pair, sent to browsers"""
+    return f'{version}-{day:%Y%m%d}'
+
+def _get_chart_json(chart_type, language, days):
+    """Return (etag, chart JSON) for the current data version"""
+    key = (chart_type, language, days)
+    with _chart_keys_lock:
+        _chart_keys[key] = None
+        _chart_keys.move_to_end(key)
+        while len(_chart_keys) > CHART_CACHE_SIZE:
+            _chart_keys.popitem(last=False)
+    return _render_chart(chart_type, language, days, *_chart_version())
+
+# Socket clients subscribed to live stats, by (language, days). Each
+# subscription is a room, and stats are pushed to the room once per data
+# change instead of being recomputed for every client
+_live_stats_subscribers = {}
+
+def _live_stats_room(language, days):
+    """Socket.IO room for one live stats subscription"""
+    return f'stats:{language}:{days}'
+
+def prerender_charts():
+    """Background task: on each data change, drop cached stats, re-render
+    requested charts, push live stats and tell connected clients to refresh"""
+    last_version = None
+    while True:
+        socketio.sleep(DATA_VERSION_POLL_INTERVAL)
+        try:
+            current = _chart_version()
+            if current == last_version:
+                continue
+            if last_version is not None:
+                dashboard_manager.invalidate()
+            with _chart_keys_lock:
+                keys = list(_chart_keys)
+            for chart_type, language, days in keys:
+                _render_chart(chart_type, language, days, *current)
+            if last_version is not None:
+                for language, days in list(_live_stats_subscribers):
+                    socketio.emit('live_stats',
+                                  dashboard_manager.get_dashboard_stats(language, days),
+                                  to=_live_stats_room(language, days))
+        except sqlite3.Error as e:
+            print(f"⚠️  Chart pre-render failed: {e}")
+            continue
+        last_version = current
+        socketio.emit('data_version', _version_token(*current))
+
+@app.route('/api/progress-chart')
+def api_progress_chart():
+    """Generate interactive progress chart"""
+    language = _language_param(request.args)
+    days = _int_param(request.args, 'days', 30, MAX_DAYS)
     
-    return jsonify(json.loads(plotly.utils.PlotlyJSONEncoder().encode(fig)))
+    etag, chart_json = _get_chart_json('progress', language, days)
+    return cached_json(chart_json, etag)
+
+@app.route('/api/topic-chart')
+def api_topic_chart():
+    """Generate topic distribution chart"""
+    language = _language_param(request.args)
+    days = _int_param(request.args, 'days', 30, MAX_DAYS)
+    
+    etag, chart_json = _get_chart_json('topic', language, days)
+    return cached_json(chart_json, etag)
 
 @socketio.on('connect')
 def handle_connect():
     """Handle websocket connection"""
     print('Client connected')
     emit('status', {'msg': 'Connected to practice dashboard'})
+    try:
+        emit('data_version', _version_token(*_chart_version()))
+    except sqlite3.Error:
+        pass
+
+@socketio.on_error_default
+def handle_socket_error(error):
+    """Report invalid socket parameters to the client; re-raise anything else"""
+    if isinstance(error, InvalidQuery):
+        emit('error', {'msg': str(error)})
+        return
+    raise error
+
+def _unsubscribe_live_stats(sid):
+    """Drop a client from whichever live stats room it is in"""
+    for key, sids in list(_live_stats_subscribers.items()):
+        if sid in sids:
+            sids.discard(sid)
+            leave_room(_live_stats_room(*key))
+            if not sids:
+                del _live_stats_subscribers[key]
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Forget a disconnected client's live stats subscription"""
+    _unsubscribe_live_stats(request.sid)
 
 @socketio.on('request_live_stats')
 def handle_live_stats(data):
-    """Handle real-time stats request"""
-    language = data.get('language', 'python')
-    days = data.get('days', 30)
+    """Subscribe to live stats for a language/window and send them now
+    
+    Later updates are pushed by the background task when data changes.
+    """
+    language = _language_param(data)
+    days = _int_param(data, 'days', 30, MAX_DAYS)
+    
+    _unsubscribe_live_stats(request.sid)
+    join_room(_live_stats_room(language, days))
+    _live_stats_subscribers.setdefault((language, days), set()).add(request.sid)
     
     stats = dashboard_manager.get_dashboard_stats(language, days)
     emit('live_stats', stats)
@@ -239,28 +1141,28 @@ def handle_live_stats(data):
 @socketio.on('request_recommendations')
 def handle_recommendations(data):
     """Handle real-time recommendations request"""
-    language = data.get('language', 'python')
-    count = data.get('count', 5)
+    language = _language_param(data)
+    count = _int_param(data, 'count', 5, MAX_COUNT)
     
     recommendations = dashboard_manager.get_real_time_recommendations(language, count)
     emit('recommendations', recommendations)
 
-def create_templates_directory():
-    """Create templates directory with dashboard HTML"""
-    templates_dir = Path('templates')
-    templates_dir.mkdir(exist_ok=True)
-    
-    dashboard_html = '''
+DASHBOARD_HTML = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Coding Practice Dashboard</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js"></script>
+    <link rel="preconnect" href="https://cdn.jsdelivr.net">
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com">
+    <script src="{{ plotly_url }}" defer></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js" defer></script>
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <!-- Icons are not needed for first paint; load them without blocking render -->
+    <link rel="preload" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" as="style" onload="this.onload=null;this.rel='stylesheet'">
+    <noscript><link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet"></noscript>
+    <link rel="preload" as="script" href="{{ script_url }}">
     <style>
         body { background-color: #f8f9fa; }
         .dashboard-card { transition: transform 0.2s; }
@@ -269,6 +1171,9 @@ def create_templates_directory():
         .chart-container { background: white; border-radius: 10px; padding: 20px; margin-bottom: 20px; }
         .recommendation-card { border-left: 4px solid #007bff; }
         .activity-item { padding: 10px; border-bottom: 1px solid #eee; }
+        /* Skip layout/paint of list items until they scroll into view */
+        .recommendation-card { content-visibility: auto; contain-intrinsic-size: auto 140px; }
+        .activity-item { content-visibility: auto; contain-intrinsic-size: auto 64px; }
         .nav-pills .nav-link.active { background-color: #007bff; }
     </style>
 </head>
@@ -420,259 +1325,470 @@ def create_templates_directory():
         </div>
     </div>
 
+    <!-- Cloned once per recommendation; filled in via textContent -->
+    <template id="recommendationTemplate">
+        <div class="card recommendation-card mb-3">
+            <div class="card-body">
+                <div class="d-flex justify-content-between align-items-start">
+                    <div>
+                        <h6 class="card-title" data-field="title"></h6>
+                        <p class="card-text">
+                            <span class="badge" data-field="difficulty"></span>
+                            <span class="badge bg-secondary ms-1" data-field="topic"></span>
+                            <span class="badge bg-info ms-1" data-field="platform"></span>
+                        </p>
+                        <p class="text-muted small" data-field="reasons"></p>
+                    </div>
+                    <div class="text-end">
+                        <small class="text-muted" data-field="score"></small>
+                        <br data-field="link-break">
+                        <a target="_blank" class="btn btn-sm btn-outline-primary mt-1" data-field="link">Open</a>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </template>
+
+    <template id="reviewStatsTemplate">
+        <div class="mb-3">
+            <h6>Review Statistics</h6>
+            <div class="row">
+                <div class="col-md-3">
+                    <div class="text-center">
+                        <div class="h4 text-danger" data-field="due"></div>
+                        <small>Due Now</small>
+                    </div>
+                </div>
+                <div class="col-md-3">
+                    <div class="text-center">
+                        <div class="h4 text-warning" data-field="upcoming"></div>
+                        <small>Next 7 Days</small>
+                    </div>
+                </div>
+                <div class="col-md-3">
+                    <div class="text-center">
+                        <div class="h4 text-info" data-field="total"></div>
+                        <small>In System</small>
+                    </div>
+                </div>
+                <div class="col-md-3">
+                    <div class="text-center">
+                        <div class="h4 text-success" data-field="ease"></div>
+                        <small>Avg Ease</small>
+                    </div>
+                </div>
+            </div>
+        </div>
+        <hr>
+    </template>
+
+    <!-- Shared by due reviews and recent activity; fields a list does not
+         use are removed -->
+    <template id="activityTemplate">
+        <div class="activity-item">
+            <div class="d-flex justify-content-between align-items-center">
+                <div>
+                    <strong data-field="title"></strong>
+                    <div>
+                        <span class="badge" data-field="difficulty"></span>
+                        <span class="badge bg-secondary ms-1" data-field="topic"></span>
+                        <small class="text-muted ms-2" data-field="detail"></small>
+                    </div>
+                </div>
+                <div class="text-end">
+                    <small data-field="when"></small>
+                    <br data-field="extra-break">
+                    <small data-field="extra"></small>
+                </div>
+            </div>
+        </div>
+    </template>
+
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        // WebSocket connection
-        const socket = io();
-        let currentLanguage = 'python';
-
-        // Initialize dashboard
-        document.addEventListener('DOMContentLoaded', function() {
-            loadDashboard();
-            setupEventListeners();
+    <script src="{{ script_url }}" defer></script>
+</body>
+</html>
+'''
+
+# Page script, served separately under a content-hashed URL so browsers can
+# cache it (and its compiled code) indefinitely
+DASHBOARD_JS = '''
+// WebSocket connection
+const socket = io();
+let currentLanguage = 'python';
+
+// Initialize dashboard
+document.addEventListener('DOMContentLoaded', function() {
+    loadDashboard();
+    setupEventListeners();
+});
+
+function setupEventListeners() {
+    // Language selector
+    document.getElementById('languageSelect').addEventListener('change', function(e) {
+        currentLanguage = e.target.value;
+        scheduleRefresh();
+    });
+
+    // Tab switches: Bootstrap's shown.bs.tab bubbles, so one listener on
+    // the nav covers every tab
+    const tabLoaders = {
+        '#recommendations': loadRecommendations,
+        '#reviews': loadReviews
+    };
+    document.getElementById('dashboardTabs').addEventListener('shown.bs.tab', function(e) {
+        const load = tabLoaders[e.target.getAttribute('href')];
+        if (load) load();
+    });
+}
+
+// Error responses carry a JSON {error} body; reject with it instead of
+// handing it to the renderers as data
+function fetchJson(url, options) {
+    return fetch(url, options).then(response => {
+        if (response.ok) return response.json();
+        return response.json().catch(() => ({})).then(body => {
+            throw new Error(body.error || `${url}: HTTP ${response.status}`);
+        });
+    });
+}
+
+// Only the newest refresh may render; starting a new one aborts the
+// requests of any refresh still in flight
+let dashboardRequest = null;
+
+function loadDashboard() {
+    if (dashboardRequest) dashboardRequest.abort();
+    dashboardRequest = new AbortController();
+    const signal = dashboardRequest.signal;
+    const language = currentLanguage;
+    const freshCharts = new Set();
+
+    // Draw the last cached figure for each chart straight away; the
+    // fresh figure replaces it when the requests below settle
+    CHARTS.forEach(chart => {
+        idbGet(chartKey(chart, language)).then(fig => {
+            if (fig && !signal.aborted && !freshCharts.has(chart.id)) drawChart(chart, fig);
         });
+    });
+
+    // Stats, recommendations and reviews come back in one response; the
+    // charts stay separate so each can revalidate to a 304 on its own.
+    // Fire every request at once and render once they have all settled
+    const query = `language=${language}&days=30`;
+    Promise.allSettled([
+        fetchJson(`/api/dashboard?${query}`, {signal, cache: 'no-cache'}),
+        ...CHARTS.map(chart => fetchJson(`${chart.url}?${query}`, {signal, cache: 'no-cache'}))
+    ]).then(([dashboard, ...figures]) => {
+        if (signal.aborted) return;
+        requestAnimationFrame(() => {
+            if (dashboard.status === 'fulfilled') {
+                renderStats(dashboard.value.stats);
+                renderRecommendations(dashboard.value.recommendations);
+                renderReviews(dashboard.value.reviews);
+            } else {
+                console.error('Error loading dashboard:', dashboard.reason);
+                renderRecommendationsError(dashboard.reason);
+            }
 
-        function setupEventListeners() {
-            // Language selector
-            document.getElementById('languageSelect').addEventListener('change', function(e) {
-                currentLanguage = e.target.value;
-                loadDashboard();
+            figures.forEach((fig, i) => {
+                const chart = CHARTS[i];
+                if (fig.status !== 'fulfilled') {
+                    console.error(`Error loading ${chart.id}:`, fig.reason);
+                    return;
+                }
+                freshCharts.add(chart.id);
+                drawChart(chart, fig.value);
+                idbPut(chartKey(chart, language), fig.value);
             });
+        });
+    });
+}
+
+const METRIC_NODES = {
+    totalSolved: document.getElementById('totalSolved'),
+    avgTime: document.getElementById('avgTime'),
+    topicsCovered: document.getElementById('topicsCovered')
+};
 
-            // Tab switches
-            document.querySelectorAll('[data-bs-toggle="pill"]').forEach(tab => {
-                tab.addEventListener('shown.bs.tab', function(e) {
-                    if (e.target.getAttribute('href') === '#recommendations') {
-                        loadRecommendations();
-                    } else if (e.target.getAttribute('href') === '#reviews') {
-                        loadReviews();
-                    }
-                });
+function renderStats(data) {
+    const stats = data.basic_stats;
+    if (stats) {
+        METRIC_NODES.totalSolved.textContent = stats[0] || 0;
+        METRIC_NODES.avgTime.textContent = stats[1] ? `${stats[1].toFixed(1)}m` : 'N/A';
+        METRIC_NODES.topicsCovered.textContent = stats[5] || 0;
+    }
+
+    loadRecentActivity(data.recent_activity);
+}
+
+// The script is deferred, so the DOM is parsed by now and the chart and
+// metric nodes can be looked up once instead of on every refresh
+const CHARTS = [
+    {id: 'progressChart', url: '/api/progress-chart'},
+    {id: 'topicChart', url: '/api/topic-chart'}
+].map(chart => ({...chart, node: document.getElementById(chart.id)}));
+
+// Chart payloads leave out the layout template; it is fetched once and
+// merged in here
+let chartTemplate = null;
+
+function getChartTemplate() {
+    if (!chartTemplate) {
+        chartTemplate = fetchJson('/api/chart-template').catch(error => {
+            chartTemplate = null;
+            throw error;
+        });
+    }
+    return chartTemplate;
+}
+
+// Plotly.react diffs against the figure already in the node, so redrawing
+// a cached figure with its fresh copy only touches what changed
+function drawChart(chart, fig) {
+    if (fig && fig.data && fig.layout) {
+        getChartTemplate()
+            .catch(() => undefined)
+            .then(template => {
+                Plotly.react(chart.node, fig.data, {...fig.layout, template}, {responsive: true});
             });
-        }
+    }
+}
 
-        function loadDashboard() {
-            loadStats();
-            loadCharts();
-            loadRecommendations();
-        }
+function chartKey(chart, language) {
+    return `chart:${chart.id}:${language}`;
+}
 
-        function loadStats() {
-            fetch(`/api/stats?language=${currentLanguage}&days=30`)
-                .then(response => response.json())
-                .then(data => {
-                    const stats = data.basic_stats;
-                    if (stats) {
-                        document.getElementById('totalSolved').textContent = stats[0] || 0;
-                        document.getElementById('avgTime').textContent = stats[1] ? `${stats[1].toFixed(1)}m` : 'N/A';
-                        document.getElementById('topicsCovered').textContent = stats[5] || 0;
-                    }
-                    
-                    // Load recent activity
-                    loadRecentActivity(data.recent_activity);
-                })
-                .catch(error => console.error('Error loading stats:', error));
-        }
+// Last-seen chart figures, kept in IndexedDB across page loads
+const chartStore = new Promise(resolve => {
+    if (!window.indexedDB) return resolve(null);
+    const request = indexedDB.open('practice-dashboard', 1);
+    request.onupgradeneeded = () => request.result.createObjectStore('charts');
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => resolve(null);
+});
 
-        function loadCharts() {
-            // Progress chart
-            fetch(`/api/progress-chart?language=${currentLanguage}&days=30`)
-                .then(response => response.json())
-                .then(fig => {
-                    if (fig.data && fig.layout) {
-                        Plotly.newPlot('progressChart', fig.data, fig.layout, {responsive: true});
-                    }
-                })
-                .catch(error => console.error('Error loading progress chart:', error));
-
-            // Topic chart
-            fetch(`/api/topic-chart?language=${currentLanguage}&days=30`)
-                .then(response => response.json())
-                .then(fig => {
-                    if (fig.data && fig.layout) {
-                        Plotly.newPlot('topicChart', fig.data, fig.layout, {responsive: true});
-                    }
-                })
-                .catch(error => console.error('Error loading topic chart:', error));
-        }
+function idbGet(key) {
+    return chartStore.then(db => db && new Promise(resolve => {
+        const request = db.transaction('charts').objectStore('charts').get(key);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(undefined);
+    }));
+}
 
-        function loadRecommendations() {
-            fetch(`/api/recommendations?language=${currentLanguage}&count=5`)
-                .then(response => response.json())
-                .then(recommendations => {
-                    const container = document.getElementById('recommendationsContainer');
-                    
-                    if (!recommendations || recommendations.length === 0) {
-                        container.innerHTML = '<p class="text-muted">No recommendations available. Solve a few problems to get personalized suggestions!</p>';
-                        return;
-                    }
-
-                    const html = recommendations.map((rec, index) => `
-                        <div class="card recommendation-card mb-3">
-                            <div class="card-body">
-                                <div class="d-flex justify-content-between align-items-start">
-                                    <div>
-                                        <h6 class="card-title">${index + 1}. ${rec.title}</h6>
-                                        <p class="card-text">
-                                            <span class="badge bg-${getDifficultyColor(rec.difficulty)}">${rec.difficulty}</span>
-                                            <span class="badge bg-secondary ms-1">${rec.topic}</span>
-                                            <span class="badge bg-info ms-1">${rec.platform}</span>
-                                        </p>
-                                        ${rec.recommendation_reasons ? `<p class="text-muted small">💡 ${rec.recommendation_reasons.join(', ')}</p>` : ''}
-                                    </div>
-                                    <div class="text-end">
-                                        <small class="text-muted">Score: ${(rec.recommendation_score || 0).toFixed(2)}</small>
-                                        ${rec.url ? `<br><a href="${rec.url}" target="_blank" class="btn btn-sm btn-outline-primary mt-1">Open</a>` : ''}
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    `).join('');
-                    
-                    container.innerHTML = html;
-                })
-                .catch(error => {
-                    console.error('Error loading recommendations:', error);
-                    document.getElementById('recommendationsContainer').innerHTML = '<p class="text-danger">Error loading recommendations</p>';
-                });
-        }
+function idbPut(key, value) {
+    chartStore.then(db => {
+        if (db) db.transaction('charts', 'readwrite').objectStore('charts').put(value, key);
+    });
+}
 
-        function loadReviews() {
-            fetch(`/api/reviews?language=${currentLanguage}`)
-                .then(response => response.json())
-                .then(data => {
-                    const container = document.getElementById('reviewsContainer');
-                    const dueReviews = data.due_reviews || [];
-                    const stats = data.stats || {};
-                    
-                    // Update due reviews counter
-                    document.getElementById('dueReviews').textContent = stats.due_count || 0;
-                    
-                    if (dueReviews.length === 0) {
-                        container.innerHTML = '<p class="text-muted">🎉 No reviews due! Great job staying on top of your studies.</p>';
-                        return;
-                    }
-
-                    const html = `
-                        <div class="mb-3">
-                            <h6>Review Statistics</h6>
-                            <div class="row">
-                                <div class="col-md-3">
-                                    <div class="text-center">
-                                        <div class="h4 text-danger">${stats.due_count || 0}</div>
-                                        <small>Due Now</small>
-                                    </div>
-                                </div>
-                                <div class="col-md-3">
-                                    <div class="text-center">
-                                        <div class="h4 text-warning">${stats.upcoming_count || 0}</div>
-                                        <small>Next 7 Days</small>
-                                    </div>
-                                </div>
-                                <div class="col-md-3">
-                                    <div class="text-center">
-                                        <div class="h4 text-info">${stats.total_in_system || 0}</div>
-                                        <small>In System</small>
-                                    </div>
-                                </div>
-                                <div class="col-md-3">
-                                    <div class="text-center">
-                                        <div class="h4 text-success">${(stats.avg_ease_factor || 0).toFixed(1)}</div>
-                                        <small>Avg Ease</small>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                        <hr>
-                        ${dueReviews.map(review => `
-                            <div class="activity-item">
-                                <div class="d-flex justify-content-between align-items-center">
-                                    <div>
-                                        <strong>${review.title}</strong>
-                                        <div>
-                                            <span class="badge bg-${getDifficultyColor(review.difficulty)}">${review.difficulty}</span>
-                                            <span class="badge bg-secondary ms-1">${review.topic}</span>
-                                            <small class="text-muted ms-2">Review #${(review.review_count || 0) + 1}</small>
-                                        </div>
-                                    </div>
-                                    <div class="text-end">
-                                        <small class="text-danger">${review.days_overdue} days overdue</small>
-                                        <br><small class="text-muted">Ease: ${(review.ease_factor || 0).toFixed(2)}</small>
-                                    </div>
-                                </div>
-                            </div>
-                        `).join('')}
-                    `;
-                    
-                    container.innerHTML = html;
-                })
-                .catch(error => {
-                    console.error('Error loading reviews:', error);
-                    document.getElementById('reviewsContainer').innerHTML = '<p class="text-danger">Error loading review data</p>';
-                });
-        }
+function loadRecommendations() {
+    fetchJson(`/api/recommendations?language=${currentLanguage}&count=5`)
+        .then(renderRecommendations)
+        .catch(renderRecommendationsError);
+}
 
-        function loadRecentActivity(activities) {
-            const container = document.getElementById('activityContainer');
-            
-            if (!activities || activities.length === 0) {
-                container.innerHTML = '<p class="text-muted">No recent activity to display.</p>';
-                return;
-            }
+function renderRecommendations(recommendations) {
+    const container = document.getElementById('recommendationsContainer');
 
-            const html = activities.map(activity => `
-                <div class="activity-item">
-                    <div class="d-flex justify-content-between align-items-center">
-                        <div>
-                            <strong>${activity[0]}</strong>
-                            <div>
-                                <span class="badge bg-${getDifficultyColor(activity[1])}">${activity[1]}</span>
-                                <span class="badge bg-secondary ms-1">${activity[2]}</span>
-                            </div>
-                        </div>
-                        <div class="text-end">
-                            <small class="text-muted">${new Date(activity[3]).toLocaleDateString()}</small>
-                            ${activity[4] ? `<br><small>${activity[4]} min</small>` : ''}
-                        </div>
-                    </div>
-                </div>
-            `).join('');
-            
-            container.innerHTML = html;
-        }
+    if (!recommendations || recommendations.length === 0) {
+        container.innerHTML = '<p class="text-muted">No recommendations available. Solve a few problems to get personalized suggestions!</p>';
+        return;
+    }
+
+    // Build every card off-DOM and swap them in with one mutation
+    const frag = document.createDocumentFragment();
+    const template = document.getElementById('recommendationTemplate').content;
+    recommendations.forEach((rec, index) => {
+        const card = template.cloneNode(true);
+        const field = name => card.querySelector(`[data-field="${name}"]`);
+
+        field('title').textContent = `${index + 1}. ${rec.title}`;
+        const difficulty = field('difficulty');
+        difficulty.classList.add(`bg-${getDifficultyColor(rec.difficulty)}`);
+        difficulty.textContent = rec.difficulty;
+        field('topic').textContent = rec.topic;
+        field('platform').textContent = rec.platform;
+        field('score').textContent = `Score: ${(rec.recommendation_score || 0).toFixed(2)}`;
 
-        function getDifficultyColor(difficulty) {
-            const colors = {
-                'easy': 'success',
-                'medium': 'warning',
-                'hard': 'danger'
-            };
-            return colors[difficulty] || 'secondary';
+        if (rec.recommendation_reasons) {
+            field('reasons').textContent = `💡 ${rec.recommendation_reasons.join(', ')}`;
+        } else {
+            field('reasons').remove();
         }
+        if (rec.url) {
+            field('link').href = rec.url;
+        } else {
+            field('link').remove();
+            field('link-break').remove();
+        }
+        frag.appendChild(card);
+    });
 
-        // WebSocket handlers
-        socket.on('connect', function() {
-            document.getElementById('connectionStatus').textContent = 'Connected';
-            document.getElementById('connectionStatus').className = 'badge bg-success';
-        });
+    container.replaceChildren(frag);
+}
+
+function renderRecommendationsError(error) {
+    console.error('Error loading recommendations:', error);
+    document.getElementById('recommendationsContainer').innerHTML = '<p class="text-danger">Error loading recommendations</p>';
+}
 
-        socket.on('disconnect', function() {
-            document.getElementById('connectionStatus').textContent = 'Disconnected';
-            document.getElementById('connectionStatus').className = 'badge bg-danger';
+function loadReviews() {
+    fetchJson(`/api/reviews?language=${currentLanguage}`)
+        .then(renderReviews)
+        .catch(error => {
+            console.error('Error loading reviews:', error);
+            document.getElementById('reviewsContainer').innerHTML = '<p class="text-danger">Error loading review data</p>';
         });
+}
 
-        // Auto-refresh every 5 minutes
-        setInterval(loadDashboard, 5 * 60 * 1000);
-    </script>
-</body>
-</html>
-    '''
-    
-    (templates_dir / 'dashboard.html').write_text(dashboard_html)
+function renderReviews(data) {
+    const container = document.getElementById('reviewsContainer');
+    const dueReviews = data.due_reviews || [];
+    const stats = data.stats || {};
+
+    // Update due reviews counter
+    document.getElementById('dueReviews').textContent = stats.due_count || 0;
+
+    if (dueReviews.length === 0) {
+        container.innerHTML = '<p class="text-muted">🎉 No reviews due! Great job staying on top of your studies.</p>';
+        return;
+    }
+
+    // Every value is set through textContent, as for recommendations
+    const frag = document.createDocumentFragment();
+    const header = document.getElementById('reviewStatsTemplate').content.cloneNode(true);
+    const stat = name => header.querySelector(`[data-field="${name}"]`);
+    stat('due').textContent = stats.due_count || 0;
+    stat('upcoming').textContent = stats.upcoming_count || 0;
+    stat('total').textContent = stats.total_in_system || 0;
+    stat('ease').textContent = (stats.avg_ease_factor || 0).toFixed(1);
+    frag.appendChild(header);
+
+    dueReviews.forEach(review => {
+        const item = activityItem(review);
+        const field = name => item.querySelector(`[data-field="${name}"]`);
+        field('detail').textContent = `Review #${(review.review_count || 0) + 1}`;
+        field('when').classList.add('text-danger');
+        field('when').textContent = `${review.days_overdue} days overdue`;
+        field('extra').classList.add('text-muted');
+        field('extra').textContent = `Ease: ${(review.ease_factor || 0).toFixed(2)}`;
+        frag.appendChild(item);
+    });
+
+    container.replaceChildren(frag);
+}
+
+// Clone an activity row and fill the fields common to every list
+function activityItem(entry) {
+    const item = document.getElementById('activityTemplate').content.cloneNode(true);
+    const field = name => item.querySelector(`[data-field="${name}"]`);
+    field('title').textContent = entry.title;
+    const difficulty = field('difficulty');
+    difficulty.classList.add(`bg-${getDifficultyColor(entry.difficulty)}`);
+    difficulty.textContent = entry.difficulty;
+    field('topic').textContent = entry.topic;
+    return item;
+}
+
+function loadRecentActivity(activities) {
+    const container = document.getElementById('activityContainer');
+
+    if (!activities || activities.length === 0) {
+        container.innerHTML = '<p class="text-muted">No recent activity to display.</p>';
+        return;
+    }
+
+    const frag = document.createDocumentFragment();
+    activities.forEach(activity => {
+        const item = activityItem(activity);
+        const field = name => item.querySelector(`[data-field="${name}"]`);
+        field('detail').remove();
+        field('when').classList.add('text-muted');
+        field('when').textContent = activity.completed_on;
+        if (activity.time_spent) {
+            field('extra').textContent = `${activity.time_spent} min`;
+        } else {
+            field('extra').remove();
+            field('extra-break').remove();
+        }
+        frag.appendChild(item);
+    });
+
+    container.replaceChildren(frag);
+}
+
+function getDifficultyColor(difficulty) {
+    const colors = {
+        'easy': 'success',
+        'medium': 'warning',
+        'hard': 'danger'
+    };
+    return Object.hasOwn(colors, difficulty) ? colors[difficulty] : 'secondary';
+}
+
+// WebSocket handlers
+socket.on('connect', function() {
+    document.getElementById('connectionStatus').textContent = 'Connected';
+    document.getElementById('connectionStatus').className = 'badge bg-success';
+});
+
+socket.on('disconnect', function() {
+    document.getElementById('connectionStatus').textContent = 'Disconnected';
+    document.getElementById('connectionStatus').className = 'badge bg-danger';
+});
+
+// Every refresh trigger (language switch, data change push) funnels
+// through here, so a burst of them costs one load per frame. A hidden tab
+// skips the load and catches up once when it is shown again
+let refreshPending = false;
+let refreshWhenVisible = false;
+
+function scheduleRefresh() {
+    if (document.visibilityState !== 'visible') {
+        refreshWhenVisible = true;
+        return;
+    }
+    if (refreshPending) return;
+    refreshPending = true;
+    requestAnimationFrame(() => {
+        refreshPending = false;
+        loadDashboard();
+    });
+}
+
+document.addEventListener('visibilitychange', () => {
+    if (refreshWhenVisible) {
+        refreshWhenVisible = false;
+        scheduleRefresh();
+    }
+});
+
+// The server pushes a new data version whenever practice data changes
+// (and once per connection); refetch only when it differs
+let dataVersion = null;
+
+socket.on('data_version', function(version) {
+    if (dataVersion !== null && version !== dataVersion) {
+        scheduleRefresh();
+    }
+    dataVersion = version;
+});
+'''
+
+_SCRIPT_BYTES = DASHBOARD_JS.lstrip().encode('utf-8')
+_SCRIPT_DIGEST = hashlib.sha256(_SCRIPT_BYTES).hexdigest()[:10]
 
 if __name__ == '__main__':
-    create_templates_directory()
+    socketio.start_background_task(prerender_charts)
     print("🌐 Starting Enhanced Web Dashboard...")
     print("📊 Dashboard available at: http://localhost:5000")
     print("🚀 Features: Real-time analytics, AI recommendations, spaced repetition tracking")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
+    
+    # Debug mode (reloader + single-process debugger) only when asked for;
+    # production deployments should use wsgi.py under gunicorn instead
+    dev_mode = bool(os.environ.get('DASH_DEV'))
+    if not dev_mode:
+        print("💡 For production, run: gunicorn -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker -w 1 wsgi:app")
+    socketio.run(app, host='0.0.0.0', port=int(os.environ.get('DASH_PORT', 5000)),
+                 debug=dev_mode, allow_unsafe_werkzeug=True) 
\ No newline at end of file
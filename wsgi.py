@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for serving the web dashboard with gunicorn + gevent
+
+    gunicorn -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker \\
+        -w 1 --worker-connections 100 wsgi:app
+
+Flask-SocketIO keeps client sessions in process memory, so run a single
+worker and scale with --worker-connections (greenlets) instead.
+"""
+
+# Patch before anything imports socket/threading so the dashboard's
+# per-thread connections and worker pools become per-greenlet
+from gevent import monkey
+monkey.patch_all()
+
+from web_dashboard import app, socketio, prerender_charts
+
+socketio.start_background_task(prerender_charts)